@@ -1,9 +1,12 @@
+import asyncio
 import os
 import sys
 import socket
 import logging
 import argparse
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,8 +16,28 @@ from lightrag.api.routers.graph import create_graph_routes
 from lightrag.api.routers.collection import create_collection_routes
 from lightrag.api.service_manager import service_manager
 from lightrag.api.routers.config_routers import create_config_routes
+from lightrag.lightrag_manager import get_lightrag_manager
 
-app = FastAPI(docs_url=None, redoc_url=None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 启动时在后台恢复上次运行中断的文档处理，不等待各集合初始化完成；
+    # 读取类接口不再触发写操作
+    resume_task = asyncio.create_task(get_lightrag_manager().resume_interrupted())
+    try:
+        yield
+    finally:
+        resume_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await resume_task
+
+
+app = FastAPI(
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Mount static files
 if getattr(sys, "frozen", False):
@@ -1,73 +1,181 @@
+import asyncio
+import os
 from pathlib import Path
 import shutil
+import uuid
 from datetime import datetime
+from typing import Optional
 from lightrag.api.schemas.collection import (
     CollectionsListData,
     CollectionCreateData,
     CollectionDeleteData,
     CollectionBatchData,
+    CollectionBatchRequest,
     CollectionItem,
     DocumentItem,
 )
 from lightrag.api.schemas.common import GenericResponse
+from lightrag.api.utils.file import is_safe_collection_id
+from lightrag.api.utils.date import parse_datetime
+from lightrag.api.utils.response import ModelORJSONResponse, orjson_response
 from lightrag.path_manager import get_default_storage_dir
-from lightrag.document_manager import DocumentManager
-from lightrag.lightrag_manager import LightRagManager
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from lightrag.document_manager import (
+    get_document_manager,
+    invalidate_document_manager,
+)
+from lightrag.lightrag_manager import get_lightrag_manager
+from fastapi import APIRouter, HTTPException, Response
 from lightrag.utils import logger
 
 
 router = APIRouter(prefix="/collection", tags=["collection"])
 
+_INPUTS_DIR = get_default_storage_dir() / "inputs"
+
+
+def _unlink_or_rmtree(path: str, is_dir: bool):
+    if is_dir:
+        shutil.rmtree(path)
+    else:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+# 待删除目录重命名为同级的 .trash-* 隐藏目录，由后台任务实际删除
+_TRASH_PREFIX = ".trash-"
+_TRASH_TASKS: set = set()
+
+
+def _move_to_trash(path: Path) -> Path:
+    """同一文件系统内原子重命名，O(1) 完成"""
+    trash = path.parent / f"{_TRASH_PREFIX}{path.name}-{uuid.uuid4().hex}"
+    path.rename(trash)
+    return trash
+
+
+def _purge_trash(parents: list):
+    """删除 parents 下所有 .trash-* 目录，包括之前未删除成功的残留"""
+    for parent in parents:
+        try:
+            with os.scandir(parent) as it:
+                trash_dirs = [e.path for e in it if e.name.startswith(_TRASH_PREFIX)]
+        except OSError:
+            continue
+        for trash in trash_dirs:
+            shutil.rmtree(trash, ignore_errors=True)
+
+
+def _clear_dirs(input_dir: Path, workspace_dir: str) -> tuple:
+    """同步删除输入目录下的所有条目和工作目录，返回 (文档数, 工作目录是否已清理)"""
+    deleted_count = 0
+    if input_dir.is_dir():
+        # DirEntry 自带目录读取时的文件类型，无需逐个 stat
+        with os.scandir(input_dir) as it:
+            items = [(entry.path, entry.is_dir(follow_symlinks=False)) for entry in it]
+        deleted_count = len(items)
+        for path, is_dir in items:
+            _unlink_or_rmtree(path, is_dir)
+
+    workspace_cleared = False
+    if workspace_dir and os.path.exists(workspace_dir):
+        shutil.rmtree(workspace_dir)
+        workspace_cleared = True
+    return deleted_count, workspace_cleared
+
+
+def _move_dirs_to_trash(input_dir: Path, workspace_dir: str) -> tuple:
+    """在工作线程中完成计数、重命名与重建输入目录，返回 (文档数, 垃圾目录父目录列表, 工作目录是否已清理)"""
+    deleted_count = 0
+    trash_parents = []
+    workspace_cleared = False
+    if input_dir.is_dir():
+        with os.scandir(input_dir) as it:
+            deleted_count = sum(1 for _ in it)
+        _move_to_trash(input_dir)
+        input_dir.mkdir(parents=True, exist_ok=True)
+        trash_parents.append(input_dir.parent)
+
+    if workspace_dir and os.path.exists(workspace_dir):
+        _move_to_trash(Path(workspace_dir))
+        trash_parents.append(Path(workspace_dir).parent)
+        workspace_cleared = True
+    return deleted_count, trash_parents, workspace_cleared
+
+
+def _schedule_purge(parents: list):
+    task = asyncio.create_task(asyncio.to_thread(_purge_trash, parents))
+    _TRASH_TASKS.add(task)
+    task.add_done_callback(_TRASH_TASKS.discard)
+
+
+def _optional_datetime(value) -> Optional[datetime]:
+    return parse_datetime(value) if value else None
+
+
+def _document_items(docs) -> list:
+    """由存储中的 {doc_id: doc_status_dict} 直接构建 DocumentItem，数据可信，跳过校验；
+    时间戳与 documents() 一样经 parse_datetime 转为 datetime，保持与字段声明一致"""
+    if not isinstance(docs, dict):
+        return []
+    construct = DocumentItem.model_construct
+    return [
+        construct(
+            doc_id=doc_id,
+            status=doc_data.get("status", "unknown"),
+            chunks_count=doc_data.get("chunks_count", 0),
+            chunks_list=doc_data.get("chunks_list", []),
+            content_summary=doc_data.get("content_summary"),
+            content_length=doc_data.get("content_length"),
+            created_at=_optional_datetime(doc_data.get("created_at")),
+            updated_at=_optional_datetime(doc_data.get("updated_at")),
+            file_path=doc_data.get("file_path"),
+            track_id=doc_data.get("track_id"),
+            metadata=doc_data.get("metadata"),
+            error_msg=doc_data.get("error_msg"),
+        )
+        for doc_id, doc_data in docs.items()
+    ]
+
 
 def create_collection_routes():
-    lightrag_manager = LightRagManager()
+    lightrag_manager = get_lightrag_manager()
+    # 集合列表响应体缓存：(版本戳, 已序列化的 JSON 字节)，版本变化即整体替换
+    list_cache: Optional[tuple] = None
 
     @router.get("", response_model=GenericResponse[CollectionsListData])
     async def list_collections() -> GenericResponse[CollectionsListData]:
         """List all collections"""
+        nonlocal list_cache
         try:
             # Initialize the RAG instance
-            rag_manager = LightRagManager()
+            rag_manager = get_lightrag_manager()
+            version = rag_manager.collections_version()
+            if list_cache is not None and list_cache[0] == version:
+                return Response(content=list_cache[1], media_type="application/json")
+
             collections = await rag_manager.list_collections()
             collections_list = []
             # collections is a mapping: collection_name -> {doc_id: doc_status_dict}
             for name, docs in collections.items():
-                documents_list = []
-                if isinstance(docs, dict):
-                    for doc_id, doc_data in docs.items():
-                        # doc_data may already be a dict with expected keys
-                        documents_list.append(
-                            DocumentItem(
-                                doc_id=doc_id,
-                                status=doc_data.get("status", "unknown"),
-                                chunks_count=doc_data.get("chunks_count", 0),
-                                chunks_list=doc_data.get("chunks_list", []),
-                                content_summary=doc_data.get("content_summary"),
-                                content_length=doc_data.get("content_length"),
-                                created_at=doc_data.get("created_at"),
-                                updated_at=doc_data.get("updated_at"),
-                                file_path=doc_data.get("file_path"),
-                                track_id=doc_data.get("track_id"),
-                                metadata=doc_data.get("metadata"),
-                                error_msg=doc_data.get("error_msg"),
-                            )
-                        )
-
                 collections_list.append(
-                    CollectionItem(collection_id=name, documents=documents_list)
+                    CollectionItem.model_construct(
+                        collection_id=name, documents=_document_items(docs)
+                    )
                 )
 
-            data = CollectionsListData(
+            data = CollectionsListData.model_construct(
                 collections=collections_list, total_collections=len(collections_list)
             )
 
-            return GenericResponse(
+            body = data.to_json_bytes(
                 status="success",
                 message=f"Found {len(collections_list)} collections",
-                data=data,
             )
+            list_cache = (version, body)
+
+            return Response(content=body, media_type="application/json")
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -77,17 +185,15 @@ def create_collection_routes():
     ) -> GenericResponse[CollectionCreateData]:
         """Create a new collection"""
         try:
-            rag_manager = LightRagManager()
-            rag = await rag_manager.create_lightrag_instance(
-                collection_id=collection_id
-            )
+            rag_manager = get_lightrag_manager()
+            rag = await rag_manager.get_rag_instance(collection_id, create=True)
             if rag is None:
                 raise HTTPException(
                     status_code=500, detail="Failed to create collection"
                 )
 
             data = CollectionCreateData(
-                collection_id=collection_id, created_at=datetime.now().isoformat()
+                collection_id=collection_id, created_at=datetime.now()
             )
 
             return GenericResponse(
@@ -98,15 +204,16 @@ def create_collection_routes():
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    class CollectionBatchRequest(BaseModel):
-        collection_ids: list[str]
-
-    @router.post("/batch", response_model=GenericResponse[CollectionBatchData])
+    @router.post(
+        "/batch",
+        response_model=GenericResponse[CollectionBatchData],
+        response_class=ModelORJSONResponse,
+    )
     async def get_collections_batch(request: CollectionBatchRequest):
         """批量获取指定集合信息（通过 JSON body 提交 collection_ids 列表）"""
         try:
             collection_ids = request.collection_ids
-            rag_manager = LightRagManager()
+            rag_manager = get_lightrag_manager()
             all_collections = await rag_manager.list_collections()
 
             # 过滤出请求的集合
@@ -115,59 +222,45 @@ def create_collection_routes():
 
             for requested_id in collection_ids:
                 if requested_id in all_collections:
-                    docs_data = all_collections[requested_id]
-                    documents_list = []
-
-                    if isinstance(docs_data, dict):
-                        for doc_id, doc_data in docs_data.items():
-                            documents_list.append(
-                                DocumentItem(
-                                    doc_id=doc_id,
-                                    status=doc_data.get("status", "unknown"),
-                                    chunks_count=doc_data.get("chunks_count", 0),
-                                    chunks_list=doc_data.get("chunks_list", []),
-                                    content_summary=doc_data.get("content_summary"),
-                                    content_length=doc_data.get("content_length"),
-                                    created_at=doc_data.get("created_at"),
-                                    updated_at=doc_data.get("updated_at"),
-                                    file_path=doc_data.get("file_path"),
-                                    track_id=doc_data.get("track_id"),
-                                    metadata=doc_data.get("metadata"),
-                                    error_msg=doc_data.get("error_msg"),
-                                )
-                            )
-
                     found_collections.append(
-                        CollectionItem(
-                            collection_id=requested_id, documents=documents_list
+                        CollectionItem.model_construct(
+                            collection_id=requested_id,
+                            documents=_document_items(all_collections[requested_id]),
                         )
                     )
                 else:
                     missing_collections.append(requested_id)
 
-            data = CollectionBatchData(
+            data = CollectionBatchData.model_construct(
                 collections=found_collections,
                 found_count=len(found_collections),
                 requested_count=len(collection_ids),
                 missing_collections=missing_collections,
             )
 
-            return GenericResponse(
-                status="success",
+            return orjson_response(
+                data,
                 message=f"Found {len(found_collections)} out of {len(collection_ids)} requested collections",
-                data=data,
             )
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.delete("", response_model=GenericResponse[CollectionDeleteData])
-    async def clear_documents(collection_id: str):
+    async def clear_documents(collection_id: str, sync_delete: bool = False):
+        """清空集合。默认将目录重命名后立即返回，实际删除在后台进行；sync_delete=true 时等待删除完成"""
+        # 防止路径穿越：collection_id 必须是输入目录和工作目录下的直接子目录名
+        if not (
+            is_safe_collection_id(collection_id, _INPUTS_DIR)
+            and is_safe_collection_id(
+                collection_id, Path(lightrag_manager.lightrag_config.WORKING_DIR)
+            )
+        ):
+            raise HTTPException(status_code=400, detail="Invalid collection_id")
+
         rag = await lightrag_manager.get_rag_instance(collection_id)
         if rag is None:
             raise HTTPException(status_code=404, detail="Collection not found")
-        doc_manager = DocumentManager(
-            input_dir=str(get_default_storage_dir() / "inputs"), workspace=collection_id
-        )
+        doc_manager = get_document_manager(collection_id)
 
         workspace_dir = rag.working_dir + f"/{collection_id}"
         input_dir = doc_manager.input_dir
@@ -177,21 +270,29 @@ def create_collection_routes():
 
         try:
             await lightrag_manager.clear_rag_instance(collection_id)
+            # 内容摘要索引存放在输入目录之外，需单独删除
+            await asyncio.to_thread(
+                doc_manager.content_hash_path.unlink, missing_ok=True
+            )
 
-            # Count documents before deletion
-            if input_dir.exists() and input_dir.is_dir():
-                deleted_documents_count = len(list(input_dir.iterdir()))
-
-                # Remove all files in the input directory
-                for item in input_dir.iterdir():
-                    if item.is_file():
-                        item.unlink()
-                    elif item.is_dir():
-                        shutil.rmtree(item)
+            if not sync_delete:
+                # 重命名为 .trash-* 后立即返回，实际删除交给后台任务
+                (
+                    deleted_documents_count,
+                    trash_parents,
+                    workspace_cleared,
+                ) = await asyncio.to_thread(_move_dirs_to_trash, input_dir, workspace_dir)
+                invalidate_document_manager(collection_id)
 
-            if workspace_dir and Path(workspace_dir).exists():
-                shutil.rmtree(workspace_dir)
-                workspace_cleared = True
+                if trash_parents:
+                    _schedule_purge(trash_parents)
+            else:
+                # 计数与删除都在同一个工作线程中完成，不阻塞事件循环
+                invalidate_document_manager(collection_id)
+                (
+                    deleted_documents_count,
+                    workspace_cleared,
+                ) = await asyncio.to_thread(_clear_dirs, input_dir, workspace_dir)
 
             message = (
                 f"All documents in collection '{collection_id}' have been cleared."
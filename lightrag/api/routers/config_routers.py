@@ -9,14 +9,19 @@ from lightrag.config_manager import (
     reload_app_config,
     save_app_config,
 )
-from lightrag.lightrag_manager import LightRagManager
+from lightrag.lightrag_manager import get_lightrag_manager
 from lightrag.api.schemas.common import (
+    EmbeddingPayload,
+    EmbeddingResult,
     GenericResponse,
+    RerankResult,
     TestResponseData,
+    TextResult,
 )
 from lightrag.api.schemas.config import (
     LLMConfigPayload,
     EmbeddingConfigPayload,
+    RerankConfigPayload,
     TestPayload,
 )
 import numpy as _np
@@ -44,9 +49,10 @@ def create_config_routes():
         try:
             reload_app_config()
             cfg = get_app_config()
+            # 子配置均来自已校验的 AppConfig，跳过重复校验
             return GenericResponse(
                 status="success",
-                data=AppConfig(
+                data=AppConfig.model_construct(
                     lightrag_config=cfg.lightrag_config,
                     llm_config=cfg.llm_config,
                     embedding_config=cfg.embedding_config,
@@ -96,9 +102,8 @@ def create_config_routes():
 
             # 清除所有现有的 RAG 实例，以便使用新配置重新创建
             # 这确保超时等配置立即生效
-            manager = LightRagManager()
-            cleared_count = len(manager.rag_instances)
-            manager.rag_instances.clear()
+            manager = get_lightrag_manager()
+            cleared_count = await manager.clear_all_rag_instances()
 
             message = f"LLM config updated. {cleared_count} RAG instance(s) cleared and will be recreated with new config."
             return GenericResponse(
@@ -140,9 +145,8 @@ def create_config_routes():
             save_app_config()
 
             # 清除所有现有的 RAG 实例，以便使用新配置重新创建
-            manager = LightRagManager()
-            cleared_count = len(manager.rag_instances)
-            manager.rag_instances.clear()
+            manager = get_lightrag_manager()
+            cleared_count = await manager.clear_all_rag_instances()
 
             message = f"Embedding config updated. {cleared_count} RAG instance(s) cleared and will be recreated with new config."
             return GenericResponse(
@@ -154,7 +158,7 @@ def create_config_routes():
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.post("/rerank", response_model=GenericResponse[RerankConfig])
-    async def configure_rerank(payload: RerankConfig):
+    async def configure_rerank(payload: RerankConfigPayload):
         """
         更新 rerank 配置并持久化。
 
@@ -229,17 +233,17 @@ def create_config_routes():
           }
 
         成功响应示例（LLM）：
-        {"status":"success","message":"LLM test succeeded","data":{"result":"..."}}
+        {"status":"success","message":"LLM test succeeded","data":{"result":{"kind":"text","value":"..."}}}
 
         成功响应示例（Embedding）：
-        {"status":"success","message":"Embedding test succeeded","data":{"result": [[0.12, -0.03, ...]]}}
+        {"status":"success","message":"Embedding test succeeded","data":{"result": {"kind": "embedding", "value": {"count": 1, "dim": 1024, "dtype": "float32", "data": "<base64>"}}}}
 
         成功响应示例（Rerank）：
-        {"status":"success","message":"Rerank test succeeded","data":{"result": [{"index": 1, "relevance_score": 0.95}, {"index": 0, "relevance_score": 0.75}]}}
+        {"status":"success","message":"Rerank test succeeded","data":{"result": {"kind": "rerank", "value": [{"index": 1, "relevance_score": 0.95}, {"index": 0, "relevance_score": 0.75}]}}}
         """
         try:
-            target = (payload.target or "").lower()
-            manager = LightRagManager()
+            target = payload.target
+            manager = get_lightrag_manager()
 
             if target == "llm":
                 binding = manager.llm_config.LLM_BINDING or "openai"
@@ -261,7 +265,7 @@ def create_config_routes():
                 return GenericResponse(
                     status="success",
                     message="LLM test succeeded",
-                    data={"result": normalized},
+                    data=TestResponseData(result=TextResult(value=normalized)),
                 )
 
             elif target == "embedding":
@@ -269,23 +273,20 @@ def create_config_routes():
                 texts = [payload.message or "Test embedding"]
                 emb = await emb_func(texts)
 
-                def _np_to_list(obj):
-                    try:
-                        if isinstance(obj, _np.ndarray):
-                            return obj.tolist()
-                    except Exception:
-                        pass
-                    if isinstance(obj, list):
-                        return [_np_to_list(x) for x in obj]
-                    return obj
-
-                normalized = _np_to_list(emb)
+                vectors = _np.asarray(emb, dtype=_np.float32)
+                if vectors.ndim == 1:
+                    vectors = vectors.reshape(1, -1)
+                payload_value = EmbeddingPayload(
+                    count=vectors.shape[0],
+                    dim=vectors.shape[1],
+                    data=vectors.tobytes(),
+                )
                 return GenericResponse(
                     status="success",
                     message="Embedding test succeeded",
-                    data={"result": normalized},
+                    data=TestResponseData(result=EmbeddingResult(value=payload_value)),
                 )
-            elif target == "rerank":
+            else:  # rerank
                 # Test rerank functionality - use message as query and documents as document list
                 query = payload.message or "什么是机器学习？"
                 documents = payload.documents or [
@@ -348,13 +349,7 @@ def create_config_routes():
                 return GenericResponse(
                     status="success",
                     message=f"Rerank test succeeded (using {binding} provider)",
-                    data={"result": result},
-                )
-
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unsupported test target. Use 'llm', 'embedding' or 'rerank'.",
+                    data=TestResponseData(result=RerankResult(value=result)),
                 )
 
         except Exception as e:
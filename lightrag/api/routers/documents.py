@@ -1,9 +1,10 @@
+import asyncio
+from collections import Counter
 from pathlib import Path
-import shutil
+import time
 import traceback
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from lightrag.path_manager import get_default_storage_dir
 from lightrag.api.schemas.document import (
     DeleteDocRequest,
     DocumentItem,
@@ -20,16 +21,39 @@ from lightrag.api.schemas.document import (
 )
 from lightrag.api.schemas.common import GenericResponse
 from lightrag.api.utils.background import (
-    background_delete_documents,
-    pipeline_index_file,
-    pipeline_index_files_batch,
+    DeleteBatcher,
+    IndexBatcher,
+)
+from lightrag.api.utils.file import (
+    commit_upload,
+    is_safe_collection_id,
+    sanitize_filename,
+    save_upload_file,
+    temp_upload_path,
+)
+from lightrag.path_manager import get_default_storage_dir
+from lightrag.kg.shared_storage import (
+    get_namespace_data,
+    get_all_update_flags_status,
+)
+from lightrag.api.utils.request import json_body, json_body_openapi
+from lightrag.api.utils.response import (
+    ModelORJSONResponse,
+    json_response,
+    orjson_response,
 )
-from lightrag.api.utils.file import sanitize_filename
-from lightrag.base import DocProcessingStatus, DocStatus
-from lightrag.document_manager import DocumentManager
-from lightrag.lightrag_manager import LightRagManager
-from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
-from lightrag.api.utils.date import format_datetime
+from lightrag.base import DocStatus
+from lightrag.document_manager import get_document_manager
+from lightrag.lightrag_manager import get_lightrag_manager
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    UploadFile,
+)
+from lightrag.api.utils.date import parse_datetime
 
 import logging
 
@@ -38,6 +62,15 @@ logger = logging.getLogger(__name__)
 
 from lightrag.utils import generate_track_id
 
+# 各集合输入目录的父目录，用于校验 collection_id
+_INPUTS_DIR = get_default_storage_dir() / "inputs"
+# 限制批次大小防止系统过载
+MAX_UPLOAD_BATCH_SIZE = 50
+
+# 流水线状态快照的缓存时间。pipeline_status 是全局命名空间，只缓存最近一次响应；
+# 前端轮询频繁，短时间内的重复请求直接复用，避免反复跨进程读取 Manager 数据
+_STATUS_CACHE_TTL = 0.25
+
 
 def create_document_routers() -> APIRouter:
     """Factory to create documents APIRouter using provided or global logger/manager.
@@ -46,9 +79,17 @@ def create_document_routers() -> APIRouter:
     """
     router = APIRouter(prefix="/documents", tags=["documents"])
 
-    lightrag_manager = LightRagManager()
+    lightrag_manager = get_lightrag_manager()
+    index_batcher = IndexBatcher()
+    delete_batcher = DeleteBatcher()
+    # (monotonic 时间戳, 响应)，单条目
+    status_cache: Optional[tuple] = None
 
-    @router.get("", response_model=GenericResponse[DocumentsListData])
+    @router.get(
+        "",
+        response_model=GenericResponse[DocumentsListData],
+        response_class=ModelORJSONResponse,
+    )
     async def documents(collection_id: str) -> GenericResponse[DocumentsListData]:
         try:
             rag = await lightrag_manager.get_rag_instance(collection_id)
@@ -56,52 +97,43 @@ def create_document_routers() -> APIRouter:
             # Use the initialized doc_status instance (not the class) and await its async get_all()
             documents_raw = await rag.doc_status.get_all()
 
+            # 存储中的数据已由 pipeline 写入，直接 model_construct 跳过逐条校验；
+            # 缺少必需字段或格式异常的记录跳过
+            construct = DocumentItem.model_construct
             doc_list = []
+            append = doc_list.append
             for doc_id, doc_data in documents_raw.items():
-                # Normalize dict to match DocProcessingStatus constructor
-                data = doc_data.copy() if isinstance(doc_data, dict) else {}
-                data.pop("content", None)
-                if "file_path" not in data:
-                    data["file_path"] = "no-file-path"
-                if "metadata" not in data:
-                    data["metadata"] = {}
-                if "error_msg" not in data:
-                    data["error_msg"] = None
-
                 try:
-                    doc_status = DocProcessingStatus(**data)
+                    append(
+                        construct(
+                            id=doc_id,
+                            collection_id=collection_id,
+                            content_summary=doc_data["content_summary"],
+                            content_length=doc_data["content_length"],
+                            status=DocStatus(doc_data["status"]),
+                            created_at=parse_datetime(doc_data["created_at"]),
+                            updated_at=parse_datetime(doc_data["updated_at"]),
+                            track_id=doc_data.get("track_id"),
+                            chunks_count=doc_data.get("chunks_count"),
+                            error_msg=doc_data.get("error_msg"),
+                            metadata=doc_data.get("metadata") or {},
+                            file_path=doc_data.get("file_path", "no-file-path"),
+                        )
+                    )
                 except Exception:
                     # Fallback: skip malformed entries
-                    logger.exception(f"Malformed doc status for {doc_id}, skipping")
+                    logger.exception("Malformed doc status for %s, skipping", doc_id)
                     continue
 
-                doc_list.append(
-                    DocumentItem(
-                        id=doc_id,
-                        collection_id=collection_id,
-                        content_summary=doc_status.content_summary,
-                        content_length=doc_status.content_length,
-                        status=doc_status.status,
-                        created_at=format_datetime(doc_status.created_at),
-                        updated_at=format_datetime(doc_status.updated_at),
-                        track_id=doc_status.track_id,
-                        chunks_count=doc_status.chunks_count,
-                        error_msg=doc_status.error_msg,
-                        metadata=doc_status.metadata,
-                        file_path=doc_status.file_path,
-                    )
-                )
-
-            data = DocumentsListData(
+            data = DocumentsListData.model_construct(
                 documents=doc_list,
                 total_documents=len(doc_list),
                 collection_id=collection_id,
             )
 
-            return GenericResponse(
-                status="success",
+            return orjson_response(
+                data,
                 message=f"Found {len(doc_list)} documents in collection '{collection_id}'",
-                data=data,
             )
 
         except HTTPException as e:
@@ -138,7 +170,7 @@ def create_document_routers() -> APIRouter:
                     )
                 )
 
-            data = DocumentChunksData(
+            data = DocumentChunksData.model_construct(
                 doc_id=doc_id,
                 chunks=chunks,
                 total_chunks=len(chunks_raw),
@@ -146,10 +178,8 @@ def create_document_routers() -> APIRouter:
                 offset=offset,
             )
 
-            return GenericResponse(
-                status="success",
-                message=f"Retrieved {len(chunks)} chunks for document '{doc_id}'",
-                data=data,
+            return json_response(
+                data, message=f"Retrieved {len(chunks)} chunks for document '{doc_id}'"
             )
         except HTTPException as e:
             raise e
@@ -160,17 +190,16 @@ def create_document_routers() -> APIRouter:
     @router.post("/upload", response_model=GenericResponse[DocumentUploadData])
     async def upload_to_input_dir(
         collection_id: str,
-        background_tasks: BackgroundTasks,
         file: UploadFile = File(...),
     ) -> GenericResponse[DocumentUploadData]:
+        if not is_safe_collection_id(collection_id, _INPUTS_DIR):
+            raise HTTPException(status_code=400, detail="Invalid collection_id")
+
         try:
             # Sanitize filename to prevent Path Traversal attacks
-            doc_manager = DocumentManager(
-                input_dir=str(get_default_storage_dir() / "inputs"),
-                workspace=collection_id,
-            )
+            doc_manager = get_document_manager(collection_id)
 
-            rag = await lightrag_manager.create_lightrag_instance(collection_id)
+            rag = await lightrag_manager.get_rag_instance(collection_id, create=True)
 
             safe_filename = sanitize_filename(file.filename, doc_manager.input_dir)
 
@@ -182,7 +211,7 @@ def create_document_routers() -> APIRouter:
 
             file_path = doc_manager.input_dir / safe_filename
             # Check if file already exists
-            if file_path.exists():
+            if doc_manager.has_input_file(safe_filename):
                 data = DocumentUploadData(
                     filename=safe_filename,
                     upload_status="duplicated",
@@ -197,18 +226,47 @@ def create_document_routers() -> APIRouter:
                     data=data,
                 )
 
-            # Get file size
-            file.file.seek(0, 2)  # Seek to end
-            file_size = file.file.tell()
-            file.file.seek(0)  # Seek back to beginning
+            # 先写入临时文件，完整写完后再以最终文件名原子发布
+            tmp_path = temp_upload_path(file_path)
+            try:
+                file_size, digest = await save_upload_file(file, tmp_path)
+
+                # 内容去重：相同内容已以其他文件名上传过。查重、发布与记录在同一把锁内完成，
+                # 并发上传相同内容时只有一个能通过
+                async with doc_manager.content_lock:
+                    existing = await doc_manager.find_duplicate_content(
+                        digest, rag.doc_status
+                    )
+                    if existing is not None:
+                        duplicate_message = f"File '{safe_filename}' has the same content as '{existing}'."
+                    elif not await asyncio.to_thread(commit_upload, tmp_path, file_path):
+                        duplicate_message = f"File '{safe_filename}' already exists in the input directory."
+                    else:
+                        duplicate_message = None
+                        doc_manager.add_input_file(safe_filename)
+                        await doc_manager.record_content_hash(digest, safe_filename)
+            finally:
+                tmp_path.unlink(missing_ok=True)
 
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            if duplicate_message is not None:
+                data = DocumentUploadData(
+                    filename=safe_filename,
+                    upload_status="duplicated",
+                    message=duplicate_message,
+                    track_id="",
+                    processing_started=False,
+                    timestamp=datetime.now(),
+                )
+                return GenericResponse(
+                    status="success",
+                    message="File duplicate check completed",
+                    data=data,
+                )
 
             track_id = generate_track_id("upload")
 
-            # Add to background tasks and get track_id
-            background_tasks.add_task(pipeline_index_file, rag, file_path, track_id)
+            # 交给按集合合并的索引批处理器，短时间内的多次上传只运行一次 pipeline
+            index_batcher.submit(collection_id, rag, file_path, track_id)
 
             data = DocumentUploadData(
                 filename=safe_filename,
@@ -234,20 +292,19 @@ def create_document_routers() -> APIRouter:
     @router.post("/upload_batch", response_model=GenericResponse[BatchUploadData])
     async def upload_files_batch(
         collection_id: str,
-        background_tasks: BackgroundTasks,
         files: List[UploadFile] = File(...),
     ) -> GenericResponse[BatchUploadData]:
         """批量上传文件到指定collection"""
 
         if not files:
             raise HTTPException(status_code=400, detail="No files provided for upload")
+        if not is_safe_collection_id(collection_id, _INPUTS_DIR):
+            raise HTTPException(status_code=400, detail="Invalid collection_id")
 
-        # 限制批次大小防止系统过载
-        MAX_BATCH_SIZE = 50
-        if len(files) > MAX_BATCH_SIZE:
+        if len(files) > MAX_UPLOAD_BATCH_SIZE:
             raise HTTPException(
                 status_code=400,
-                detail=f"Batch size too large. Maximum {MAX_BATCH_SIZE} files per batch"
+                detail=f"Batch size too large. Maximum {MAX_UPLOAD_BATCH_SIZE} files per batch"
             )
 
         try:
@@ -261,11 +318,8 @@ def create_document_routers() -> APIRouter:
             duplicate_count = 0
 
             # 获取RAG实例（只需要一次）
-            doc_manager = DocumentManager(
-                input_dir=str(get_default_storage_dir() / "inputs"),
-                workspace=collection_id
-            )
-            rag = await lightrag_manager.create_lightrag_instance(collection_id)
+            doc_manager = get_document_manager(collection_id)
+            rag = await lightrag_manager.get_rag_instance(collection_id, create=True)
 
             if rag is None:
                 raise HTTPException(status_code=500, detail="Failed to create RAG instance")
@@ -292,7 +346,7 @@ def create_document_routers() -> APIRouter:
                     file_path = doc_manager.input_dir / safe_filename
 
                     # 检查文件是否已存在
-                    if file_path.exists():
+                    if doc_manager.has_input_file(safe_filename):
                         uploaded_files.append(BatchUploadItem(
                             filename=safe_filename,
                             upload_status="duplicated",
@@ -301,14 +355,35 @@ def create_document_routers() -> APIRouter:
                         duplicate_count += 1
                         continue
 
-                    # 获取文件大小
-                    file.file.seek(0, 2)
-                    file_size = file.file.tell()
-                    file.file.seek(0)
-
-                    # 保存文件
-                    with open(file_path, "wb") as buffer:
-                        shutil.copyfileobj(file.file, buffer)
+                    # 保存文件：先写入临时文件，完整写完后再以最终文件名原子发布
+                    tmp_path = temp_upload_path(file_path)
+                    try:
+                        file_size, digest = await save_upload_file(file, tmp_path)
+
+                        # 内容去重：相同内容已上传过（包括本批次中较早的文件）
+                        async with doc_manager.content_lock:
+                            existing = await doc_manager.find_duplicate_content(
+                                digest, rag.doc_status
+                            )
+                            if existing is not None:
+                                duplicate_message = f"File '{safe_filename}' has the same content as '{existing}'"
+                            elif not await asyncio.to_thread(commit_upload, tmp_path, file_path):
+                                duplicate_message = f"File '{safe_filename}' already exists"
+                            else:
+                                duplicate_message = None
+                                doc_manager.add_input_file(safe_filename)
+                                await doc_manager.record_content_hash(digest, safe_filename)
+                    finally:
+                        tmp_path.unlink(missing_ok=True)
+
+                    if duplicate_message is not None:
+                        uploaded_files.append(BatchUploadItem(
+                            filename=safe_filename,
+                            upload_status="duplicated",
+                            message=duplicate_message
+                        ))
+                        duplicate_count += 1
+                        continue
 
                     # 添加到成功文件列表，等待批量处理
                     successful_file_paths.append(file_path)
@@ -333,11 +408,11 @@ def create_document_routers() -> APIRouter:
 
             # 第二步：如果成功上传了文件，启动批量后台处理
             if successful_file_paths:
-                background_tasks.add_task(
-                    pipeline_index_files_batch,
+                # 交给该集合唯一的索引 worker，与单文件上传共用同一条处理通道
+                index_batcher.submit_many(
+                    collection_id,
                     rag,
-                    successful_file_paths,
-                    batch_track_id
+                    [(file_path, batch_track_id) for file_path in successful_file_paths],
                 )
 
             # 确定批次状态
@@ -352,7 +427,7 @@ def create_document_routers() -> APIRouter:
                 message = f"{successful_count} succeeded, {failed_count} failed, {duplicate_count} duplicates"
 
             # 构建响应数据
-            data = BatchUploadData(
+            data = BatchUploadData.model_construct(
                 batch_track_id=batch_track_id,
                 total_files=len(files),
                 successful_uploads=successful_count,
@@ -407,67 +482,46 @@ def create_document_routers() -> APIRouter:
         Raises:
             HTTPException: If an error occurs while retrieving pipeline status (500)
         """
-        try:
-            from lightrag.kg.shared_storage import (
-                get_namespace_data,
-                get_all_update_flags_status,
-            )
+        nonlocal status_cache
+        now = time.monotonic()
+        if status_cache is not None and now - status_cache[0] < _STATUS_CACHE_TTL:
+            return status_cache[1]
 
-            await lightrag_manager.get_rag_instance(collection_id)
+        try:
+            rag = await lightrag_manager.get_rag_instance(collection_id)
 
             pipeline_status = await get_namespace_data("pipeline_status")
 
-            # Get update flags status for all namespaces
+            # Get update flags status for all namespaces (already plain bools)
             update_status = await get_all_update_flags_status()
 
-            # Convert MutableBoolean objects to regular boolean values
-            processed_update_status = {}
-            for namespace, flags in update_status.items():
-                processed_flags = []
-                for flag in flags:
-                    # Handle both multiprocess and single process cases
-                    if hasattr(flag, "value"):
-                        processed_flags.append(bool(flag.value))
-                    else:
-                        processed_flags.append(bool(flag))
-                processed_update_status[namespace] = processed_flags
-
             # Convert to regular dict if it's a Manager.dict
             status_dict = dict(pipeline_status)
 
             # Add processed update_status to the status dictionary
-            status_dict["update_status"] = processed_update_status
+            status_dict["update_status"] = update_status
 
-            # Convert history_messages to a regular list if it's a Manager.list
-            # and limit to latest 1000 entries with truncation message if needed
+            # Limit history_messages to the latest 1000 entries with a truncation
+            # message if needed. Slicing a Manager.list only transfers the slice
             if "history_messages" in status_dict:
-                history_list = list(status_dict["history_messages"])
-                total_count = len(history_list)
+                history = status_dict["history_messages"]
+                total_count = len(history)
+                latest_messages = list(history[-1000:])
 
                 if total_count > 1000:
-                    # Calculate truncated message count
-                    truncated_count = total_count - 1000
-
-                    # Take only the latest 1000 messages
-                    latest_messages = history_list[-1000:]
-
                     # Add truncation message at the beginning
                     truncation_message = (
-                        f"[Truncated history messages: {truncated_count}/{total_count}]"
+                        f"[Truncated history messages: {total_count - 1000}/{total_count}]"
                     )
-                    status_dict["history_messages"] = [
-                        truncation_message
-                    ] + latest_messages
-                else:
-                    # No truncation needed, return all messages
-                    status_dict["history_messages"] = history_list
-
-            # Ensure job_start is properly formatted as a string with timezone information
-            if "job_start" in status_dict and status_dict["job_start"]:
-                # Use format_datetime to ensure consistent formatting
-                status_dict["job_start"] = format_datetime(status_dict["job_start"])
-
-            data = PipelineStatusData(
+                    latest_messages.insert(0, truncation_message)
+                status_dict["history_messages"] = latest_messages
+
+            # job_start is stored as an ISO string; formatting happens at serialization
+            if status_dict.get("job_start"):
+                status_dict["job_start"] = parse_datetime(status_dict["job_start"])
+
+            # 状态由 pipeline 自身写入，可信，跳过逐字段校验（history 可达上千条）
+            data = PipelineStatusData.model_construct(
                 autoscanned=status_dict.get("autoscanned", False),
                 busy=status_dict.get("busy", False),
                 job_name=status_dict.get("job_name", "Default Job"),
@@ -482,11 +536,15 @@ def create_document_routers() -> APIRouter:
                 timestamp=datetime.now(),
             )
 
-            return GenericResponse(
+            response = GenericResponse(
                 status="success",
                 message="Pipeline status retrieved successfully",
                 data=data,
             )
+            # 只缓存已存在集合的响应
+            if rag is not None:
+                status_cache = (now, response)
+            return response
         except Exception as e:
             logger.error(f"Error getting pipeline status: {str(e)}")
             logger.error(traceback.format_exc())
@@ -495,6 +553,7 @@ def create_document_routers() -> APIRouter:
     @router.get(
         "/track_status",
         response_model=GenericResponse[TrackStatusData],
+        response_class=ModelORJSONResponse,
     )
     async def get_track_status(
         collection_id: str, track_id: str
@@ -524,50 +583,52 @@ def create_document_routers() -> APIRouter:
 
             track_id = track_id.strip()
 
+            # 删除任务的 track_id：文档已从存储中移除，返回每个文档的删除状态统计
+            delete_result = delete_batcher.get_result(track_id)
+            if delete_result is not None:
+                data = TrackStatusData.model_construct(
+                    track_id=track_id,
+                    documents=[],
+                    total_count=len(delete_result),
+                    status_summary=dict(Counter(delete_result.values())),
+                    timestamp=datetime.now(),
+                )
+                return orjson_response(
+                    data,
+                    message=f"Retrieved deletion status for {len(delete_result)} documents with track_id '{track_id}'",
+                )
+
             rag = await lightrag_manager.get_rag_instance(collection_id)
 
             # Get documents by track_id
             docs_by_track_id = await rag.aget_docs_by_track_id(track_id)
 
-            # Convert to response format
-            documents = []
-            status_summary = {}
-
-            for doc_id, doc_status in docs_by_track_id.items():
-                documents.append(
-                    DocumentItem(
-                        id=doc_id,
-                        collection_id=collection_id,
-                        content_summary=doc_status.content_summary,
-                        content_length=doc_status.content_length,
-                        status=doc_status.status,
-                        created_at=format_datetime(doc_status.created_at),
-                        updated_at=format_datetime(doc_status.updated_at),
-                        track_id=doc_status.track_id,
-                        chunks_count=doc_status.chunks_count,
-                        error_msg=doc_status.error_msg,
-                        metadata=doc_status.metadata,
-                        file_path=doc_status.file_path,
-                    )
+            # Convert to response format; storage data is trusted, skip validation
+            construct = DocumentItem.model_construct
+            documents = [
+                construct(
+                    id=doc_id,
+                    collection_id=collection_id,
+                    content_summary=doc_status.content_summary,
+                    content_length=doc_status.content_length,
+                    status=DocStatus(doc_status.status),
+                    created_at=parse_datetime(doc_status.created_at),
+                    updated_at=parse_datetime(doc_status.updated_at),
+                    track_id=doc_status.track_id,
+                    chunks_count=doc_status.chunks_count,
+                    error_msg=doc_status.error_msg,
+                    metadata=doc_status.metadata,
+                    file_path=doc_status.file_path,
                 )
-
-                # Build status summary
-                # Handle both DocStatus enum and string cases for robust deserialization
-                status_key = str(doc_status.status)
-                status_summary[status_key] = status_summary.get(status_key, 0) + 1
-
-            data = TrackStatusData(
-                track_id=track_id,
-                documents=documents,
-                total_count=len(documents),
-                status_summary=status_summary,
-                timestamp=datetime.now(),
+                for doc_id, doc_status in docs_by_track_id.items()
+            ]
+            data = TrackStatusData.from_documents(
+                track_id, documents, timestamp=datetime.now()
             )
 
-            return GenericResponse(
-                status="success",
+            return orjson_response(
+                data,
                 message=f"Retrieved status for {len(documents)} documents with track_id '{track_id}'",
-                data=data,
             )
 
         except HTTPException:
@@ -580,11 +641,11 @@ def create_document_routers() -> APIRouter:
     @router.delete(
         "/delete_document",
         response_model=GenericResponse[DocumentDeletionData],
+        openapi_extra=json_body_openapi(DeleteDocRequest),
     )
     async def delete_document(
         collection_id: str,
-        delete_request: DeleteDocRequest,
-        background_tasks: BackgroundTasks,
+        delete_request: DeleteDocRequest = Depends(json_body(DeleteDocRequest)),
     ) -> GenericResponse[DocumentDeletionData]:
         """
         Delete documents and all their associated data by their IDs using background processing.
@@ -598,11 +659,11 @@ def create_document_routers() -> APIRouter:
 
         Args:
             delete_request (DeleteDocRequest): The request containing the document IDs and delete_file options.
-            background_tasks: FastAPI BackgroundTasks for async processing
 
         Returns:
             DeleteDocByIdResponse: The result of the deletion operation.
-                - status="deletion_started": The document deletion has been initiated in the background.
+                - status="deletion_started": The document deletion has been scheduled in the background;
+                  the per-document result is available from track_status with the returned track_id.
                 - status="busy": The pipeline is busy with another operation.
                 - status="not_allowed": Operation not allowed when LLM cache for entity extraction is disabled.
 
@@ -611,21 +672,22 @@ def create_document_routers() -> APIRouter:
               - 500: If an unexpected internal error occurs during initialization.
         """
         doc_ids = delete_request.doc_ids
+        # 每个请求只取一次当前时间，供 operation_id 与 timestamp 共用
+        now = datetime.now()
+        operation_id = f"del_{now.strftime('%Y%m%d_%H%M%S')}"
         rag = await lightrag_manager.get_rag_instance(collection_id)
-        doc_manager = DocumentManager(
-            input_dir=str(get_default_storage_dir() / "inputs"), workspace=collection_id
-        )
+        doc_manager = get_document_manager(collection_id)
 
         # The rag object is initialized from the server startup args,
         # so we can access its properties here.
         if not rag.enable_llm_cache_for_entity_extract:
             data = DocumentDeletionData(
-                operation_id=f"del_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                operation_id=operation_id,
                 status="not_allowed",
                 message="Operation not allowed when LLM cache for entity extraction is disabled.",
                 affected_documents=doc_ids,
                 files_to_delete=delete_request.delete_file,
-                timestamp=datetime.now(),
+                timestamp=now,
             )
             return GenericResponse(
                 status="success",
@@ -634,40 +696,42 @@ def create_document_routers() -> APIRouter:
             )
 
         try:
-            from lightrag.kg.shared_storage import get_namespace_data
-
             pipeline_status = await get_namespace_data("pipeline_status")
 
             # Check if pipeline is busy
             if pipeline_status.get("busy", False):
                 data = DocumentDeletionData(
-                    operation_id=f"del_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                    operation_id=operation_id,
                     status="busy",
                     message="Cannot delete documents while pipeline is busy",
                     affected_documents=doc_ids,
                     files_to_delete=delete_request.delete_file,
-                    timestamp=datetime.now(),
+                    timestamp=now,
                 )
                 return GenericResponse(
                     status="success", message="Pipeline busy check completed", data=data
                 )
 
-            # Add deletion task to background tasks
-            background_tasks.add_task(
-                background_delete_documents,
+            # 交给按集合合并的删除批处理器，短时间内的多次删除只运行一次删除任务；
+            # 执行时的 busy 检查结果与各文档的删除结果可通过 track_status 查询
+            track_id = generate_track_id("delete")
+            delete_batcher.submit(
+                collection_id,
                 rag,
                 doc_manager,
                 doc_ids,
                 delete_request.delete_file,
+                track_id,
             )
 
             data = DocumentDeletionData(
-                operation_id=f"del_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                operation_id=operation_id,
                 status="deletion_started",
-                message=f"Document deletion for {len(doc_ids)} documents has been initiated. Processing will continue in background.",
+                message=f"Document deletion for {len(doc_ids)} documents has been initiated. Processing will continue in background; query track_status with track_id '{track_id}' for the result.",
                 affected_documents=doc_ids,
                 files_to_delete=delete_request.delete_file,
-                timestamp=datetime.now(),
+                track_id=track_id,
+                timestamp=now,
             )
 
             return GenericResponse(
@@ -699,8 +763,6 @@ def create_document_routers() -> APIRouter:
                     status_code=404, detail=f"Collection '{collection_id}' not found"
                 )
 
-            from lightrag.kg.shared_storage import get_namespace_data
-
             pipeline_status = await get_namespace_data("pipeline_status")
 
             if pipeline_status.get("busy", False):
@@ -13,18 +13,19 @@ from lightrag.api.schemas.graph import (
     RelationUpdateData,
 )
 from lightrag.api.schemas.common import GenericResponse
+from lightrag.api.utils.response import json_response
 from lightrag.utils import (
     logger,
 )
 
-from lightrag.lightrag_manager import LightRagManager
+from lightrag.lightrag_manager import LightRagManager, get_lightrag_manager
 
 router = APIRouter(prefix="/graph", tags=["graph"])
 
 
 async def get_rag_manager():
     """Dependency to get LightRagManager instance"""
-    return LightRagManager()
+    return get_lightrag_manager()
 
 
 async def get_rag_instance(
@@ -83,7 +84,10 @@ async def get_knowledge_graph(
     try:
         # Log the label parameter to check for leading spaces
         logger.debug(
-            f"get_knowledge_graph called with label: '{label}' (length: {len(label)}, repr: {repr(label)})"
+            "get_knowledge_graph called with label: '%s' (length: %d, repr: %r)",
+            label,
+            len(label),
+            label,
         )
         graph_result = await rag.get_knowledge_graph(
             node_label=label,
@@ -110,7 +114,7 @@ async def get_knowledge_graph(
             for edge in graph_result.edges
         ]
 
-        data = GraphData(
+        data = GraphData.model_construct(
             nodes=nodes,
             edges=edges,
             total_nodes=len(nodes),
@@ -124,10 +128,9 @@ async def get_knowledge_graph(
             timestamp=datetime.now(),
         )
 
-        return GenericResponse(
-            status="success",
+        return json_response(
+            data,
             message=f"Retrieved knowledge graph for label '{label}' with {len(nodes)} nodes and {len(edges)} edges",
-            data=data,
         )
     except Exception as e:
         logger.error(f"Error getting knowledge graph for label '{label}': {str(e)}")
@@ -2,22 +2,28 @@ import json
 import time
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
 from lightrag.api.schemas.query import QueryRequest, QueryResponse
 from lightrag.api.schemas.common import GenericResponse
+from lightrag.api.utils.request import json_body, json_body_openapi
 from ascii_colors import trace_exception
 
-from lightrag.lightrag_manager import LightRagManager
+from lightrag.lightrag_manager import get_lightrag_manager
 
 
 router = APIRouter(tags=["query"])
 
 
 def create_query_routes():
-    @router.post("/query", response_model=GenericResponse[QueryResponse])
+    @router.post(
+        "/query",
+        response_model=GenericResponse[QueryResponse],
+        openapi_extra=json_body_openapi(QueryRequest),
+    )
     async def query_text(
-        collection_id: str, request: QueryRequest
+        collection_id: str,
+        request: QueryRequest = Depends(json_body(QueryRequest)),
     ) -> GenericResponse[QueryResponse]:
         """
         处理 POST /query 请求，使用 RAG（检索增强生成）能力处理用户查询。
@@ -56,7 +62,7 @@ def create_query_routes():
         """
         try:
             param = request.to_query_params(False)
-            lightrag_manager = LightRagManager()
+            lightrag_manager = get_lightrag_manager()
             rag = await lightrag_manager.get_rag_instance(collection_id=collection_id)
             response = await rag.aquery(request.query, param=param)
 
@@ -1,9 +1,15 @@
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+from lightrag.api.schemas.common import ORJSON_OPTIONS, RESPONSE_CONFIG, orjson_default
 
 
 class DocumentEntry(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     status: str = Field(..., description="Processing status of the document")
     chunks_count: int = Field(..., description="Number of chunks")
     chunks_list: List[str] = Field(
@@ -15,12 +21,8 @@ class DocumentEntry(BaseModel):
     content_length: Optional[int] = Field(
         None, description="Length of the document content in characters"
     )
-    created_at: Optional[str] = Field(
-        None, description="Creation timestamp (ISO string)"
-    )
-    updated_at: Optional[str] = Field(
-        None, description="Last update timestamp (ISO string)"
-    )
+    created_at: Optional[datetime] = Field(None, description="Creation timestamp")
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
     file_path: Optional[str] = Field(None, description="Path to the original file")
     track_id: Optional[str] = Field(None, description="Track id for this document")
     metadata: Optional[Dict[str, Any]] = Field(
@@ -31,36 +33,13 @@ class DocumentEntry(BaseModel):
     )
 
 
-class DocumentItem(BaseModel):
+class DocumentItem(DocumentEntry):
     doc_id: str = Field(..., description="Document identifier")
-    status: str = Field(..., description="Processing status of the document")
-    chunks_count: int = Field(..., description="Number of chunks")
-    chunks_list: List[str] = Field(
-        default_factory=list, description="List of chunk ids"
-    )
-    content_summary: Optional[str] = Field(
-        None, description="Summary of the document content"
-    )
-    content_length: Optional[int] = Field(
-        None, description="Length of the document content in characters"
-    )
-    created_at: Optional[str] = Field(
-        None, description="Creation timestamp (ISO string)"
-    )
-    updated_at: Optional[str] = Field(
-        None, description="Last update timestamp (ISO string)"
-    )
-    file_path: Optional[str] = Field(None, description="Path to the original file")
-    track_id: Optional[str] = Field(None, description="Track id for this document")
-    metadata: Optional[Dict[str, Any]] = Field(
-        None, description="Optional metadata dictionary"
-    )
-    error_msg: Optional[str] = Field(
-        None, description="Error message if processing failed"
-    )
 
 
 class CollectionItem(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     collection_id: str = Field(..., description="Collection identifier")
     documents: List[DocumentItem] = Field(
         default_factory=list, description="List of documents in this collection"
@@ -76,8 +55,15 @@ class CollectionsListData(BaseModel):
     )
     total_collections: int = Field(0, description="Total number of collections")
 
-    class Config:
-        json_schema_extra = {
+    def to_json_bytes(self, status: str, message: Optional[str] = None) -> bytes:
+        """直接用 orjson 序列化 GenericResponse 外壳，跳过 pydantic-core 对
+        chunks_list 等大列表的逐元素序列化"""
+        payload = {"status": status, "message": message, "data": self}
+        return orjson.dumps(payload, default=orjson_default, option=ORJSON_OPTIONS)
+
+    model_config = ConfigDict(
+        **RESPONSE_CONFIG,
+        json_schema_extra={
             "example": {
                 "collections": [
                     {
@@ -109,21 +95,28 @@ class CollectionsListData(BaseModel):
                 ],
                 "total_collections": 1
             }
-        }
+        },
+    )
 
 
 class CollectionCreateData(BaseModel):
     """集合创建结果数据"""
     collection_id: str = Field(..., description="Created collection identifier")
-    created_at: Optional[str] = Field(None, description="Creation timestamp (ISO string)")
+    created_at: Optional[datetime] = Field(None, description="Creation timestamp")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "collection_id": "my_collection",
                 "created_at": "2025-09-11T00:28:26.700465+00:00"
             }
         }
+    )
+
+
+class CollectionBatchRequest(BaseModel):
+    """批量获取集合请求"""
+    collection_ids: List[str] = Field(..., description="要查询的集合ID列表")
 
 
 class CollectionBatchData(BaseModel):
@@ -139,8 +132,8 @@ class CollectionBatchData(BaseModel):
         description="未找到的集合ID列表"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "collections": [
                     {
@@ -153,6 +146,7 @@ class CollectionBatchData(BaseModel):
                 "missing_collections": ["nonexistent_collection"]
             }
         }
+    )
 
 
 class CollectionDeleteData(BaseModel):
@@ -161,11 +155,12 @@ class CollectionDeleteData(BaseModel):
     deleted_documents_count: int = Field(0, description="Number of documents deleted")
     workspace_cleared: bool = Field(False, description="Whether workspace was cleared")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "collection_id": "my_collection",
                 "deleted_documents_count": 5,
                 "workspace_cleared": True
             }
         }
+    )
@@ -1,24 +1,87 @@
-from typing import Any, Dict, Optional, TypeVar, Generic, List, Union
-from pydantic import BaseModel
+from typing import Annotated, Any, Dict, Literal, Optional, TypeVar, Generic, List, Union
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 T = TypeVar("T")
 
+# orjson 序列化选项：UTC 时间输出为 "Z"，与 pydantic 的 JSON 输出保持一致
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+# 响应模型统一配置：只写一次的冻结实例，忽略未声明字段
+RESPONSE_CONFIG = ConfigDict(frozen=True, extra="ignore")
+
+
+def orjson_default(obj: Any) -> Any:
+    """orjson default 钩子：把 pydantic 模型编码为字段字典
+
+    没有 field_serializer 的模型直接返回自身的 __dict__，避免为每个条目构造临时 dict；
+    定义了 field_serializer 的模型走 model_dump()，输出与 model_dump_json 一致
+    """
+    if isinstance(obj, BaseModel):
+        if type(obj).__pydantic_decorators__.field_serializers:
+            return obj.model_dump()
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 
 class GenericResponse(BaseModel, Generic[T]):
     """通用响应结构，支持泛型data字段。"""
 
-    status: str
+    status: Literal["success", "error"]
     message: Optional[str] = None
     data: Optional[T] = None
 
 
+class TextResult(BaseModel):
+    """LLM 测试结果"""
+
+    model_config = RESPONSE_CONFIG
+
+    kind: Literal["text"] = "text"
+    value: str
+
+
+class EmbeddingPayload(BaseModel):
+    """打包为 float32 字节的向量矩阵，JSON 中以 base64 输出"""
+
+    model_config = ConfigDict(**RESPONSE_CONFIG, ser_json_bytes="base64")
+
+    count: int
+    dim: int
+    dtype: Literal["float32"] = "float32"
+    data: bytes
+
+
+class EmbeddingResult(BaseModel):
+    """Embedding 测试结果"""
+
+    model_config = RESPONSE_CONFIG
+
+    kind: Literal["embedding"] = "embedding"
+    value: EmbeddingPayload
+
+
+class RerankResult(BaseModel):
+    """Rerank 测试结果"""
+
+    model_config = RESPONSE_CONFIG
+
+    kind: Literal["rerank"] = "rerank"
+    value: List[Dict[str, Any]]
+
+
 class TestResponseData(BaseModel):
     """测试接口返回的数据结构。
 
-    `result` 字段可以是：
-    - LLM 返回的字符串
-    - Embedding 返回的向量列表（List[List[float]]）
-    - Rerank 返回的重排序结果（List[Dict[str, Any]]）
+    `result` 是按 `kind` 区分的联合类型：
+    - text: LLM 返回的字符串
+    - embedding: Embedding 返回的向量，按 float32 打包（EmbeddingPayload）
+    - rerank: Rerank 返回的重排序结果（List[Dict[str, Any]]）
     """
 
-    result: Union[str, List[List[float]], List[Dict[str, Any]]]
+    model_config = RESPONSE_CONFIG
+
+    result: Annotated[
+        Union[TextResult, EmbeddingResult, RerankResult],
+        Field(discriminator="kind"),
+    ]
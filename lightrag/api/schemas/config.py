@@ -3,8 +3,17 @@ Configuration API schemas for LightRAG.
 API接口相关的数据结构定义。
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Literal, Optional
+from pydantic import BaseModel, BeforeValidator, Field, StringConstraints
+
+
+# 可复用的服务地址类型，所有 *_BINDING_HOST 字段共享同一个规则：只去掉首尾空白，
+# 不限制协议，保持 "localhost:11434"、空字符串等原有取值可用
+BindingHostStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+
+
+def _lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
 
 
 class LLMConfigPayload(BaseModel):
@@ -12,7 +21,7 @@ class LLMConfigPayload(BaseModel):
 
     LLM_BINDING: Optional[str] = Field(None, description="LLM服务提供商")
     LLM_MODEL: Optional[str] = Field(None, description="LLM模型名称")
-    LLM_BINDING_HOST: Optional[str] = Field(None, description="LLM服务地址")
+    LLM_BINDING_HOST: Optional[BindingHostStr] = Field(None, description="LLM服务地址")
     LLM_BINDING_API_KEY: Optional[str] = Field(None, description="LLM API密钥")
     LLM_TIMEOUT: Optional[int] = Field(
         None, description="LLM超时时间（秒），影响Worker执行超时=LLM_TIMEOUT*2"
@@ -24,7 +33,9 @@ class EmbeddingConfigPayload(BaseModel):
 
     EMBEDDING_BINDING: Optional[str] = Field(None, description="Embedding服务提供商")
     EMBEDDING_MODEL: Optional[str] = Field(None, description="Embedding模型名称")
-    EMBEDDING_BINDING_HOST: Optional[str] = Field(None, description="Embedding服务地址")
+    EMBEDDING_BINDING_HOST: Optional[BindingHostStr] = Field(
+        None, description="Embedding服务地址"
+    )
     EMBEDDING_BINDING_API_KEY: Optional[str] = Field(
         None, description="Embedding API密钥"
     )
@@ -34,10 +45,29 @@ class EmbeddingConfigPayload(BaseModel):
     )
 
 
+class RerankConfigPayload(BaseModel):
+    """Rerank配置更新请求"""
+
+    ENABLE_RERANK: Optional[bool] = Field(None, description="是否启用重排序")
+    RERANK_BINDING: Optional[str] = Field(None, description="Rerank服务提供商")
+    RERANK_MODEL: Optional[str] = Field(None, description="Rerank模型名称")
+    RERANK_BINDING_HOST: Optional[BindingHostStr] = Field(
+        None, description="Rerank服务地址"
+    )
+    RERANK_BINDING_API_KEY: Optional[str] = Field(None, description="Rerank API密钥")
+    MIN_RERANK_SCORE: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="最低重排序分数阈值"
+    )
+
+
 class TestPayload(BaseModel):
     """配置测试请求"""
 
-    target: str = Field(default="llm", description="测试目标: llm, embedding 或 rerank")
+    target: Annotated[
+        Literal["llm", "embedding", "rerank"], BeforeValidator(_lower)
+    ] = Field(
+        default="llm", description="测试目标: llm, embedding 或 rerank"
+    )
     message: Optional[str | list[str]] = Field(default="你好", description="测试消息")
     documents: Optional[list[str]] = Field(
         None, description="测试文档列表（仅用于 rerank 测试）"
@@ -1,80 +1,91 @@
-from typing import Any, Dict, List, Literal, Optional
-from datetime import datetime
+from collections import Counter
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, List, Literal, Optional
+from datetime import datetime, timezone
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AfterValidator, BaseModel, Field, field_serializer
 
-from lightrag.api.utils.date import format_datetime
+from lightrag.api.schemas.common import RESPONSE_CONFIG
 from lightrag.base import DocStatus
 
 
+def _validate_doc_ids(doc_ids: List[str]) -> List[str]:
+    if not doc_ids:
+        raise ValueError("Document IDs list cannot be empty")
+
+    seen = set()
+    validated_ids = []
+    for doc_id in doc_ids:
+        stripped = doc_id.strip() if doc_id else ""
+        if not stripped:
+            raise ValueError("Document ID cannot be empty")
+        if stripped in seen:
+            raise ValueError("Document IDs must be unique")
+        seen.add(stripped)
+        validated_ids.append(stripped)
+
+    return validated_ids
+
+
 # 保持原有的请求模型，这些不需要改为GenericResponse格式
 class DeleteDocRequest(BaseModel):
-    doc_ids: List[str] = Field(..., description="The IDs of the documents to delete.")
+    doc_ids: Annotated[List[str], AfterValidator(_validate_doc_ids)] = Field(
+        ..., description="The IDs of the documents to delete."
+    )
     delete_file: bool = Field(
         default=False,
         description="Whether to delete the corresponding file in the upload directory.",
     )
 
-    @field_validator("doc_ids", mode="after")
-    @classmethod
-    def validate_doc_ids(cls, doc_ids: List[str]) -> List[str]:
-        if not doc_ids:
-            raise ValueError("Document IDs list cannot be empty")
-
-        validated_ids = []
-        for doc_id in doc_ids:
-            if not doc_id or not doc_id.strip():
-                raise ValueError("Document ID cannot be empty")
-            validated_ids.append(doc_id.strip())
-
-        # Check for duplicates
-        if len(validated_ids) != len(set(validated_ids)):
-            raise ValueError("Document IDs must be unique")
-
-        return validated_ids
-
 
 # 新的数据模型用于GenericResponse
 class DocumentItem(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     id: str = Field(description="Document identifier")
     collection_id: str = Field(description="Collection identifier")
     content_summary: str = Field(description="Summary of document content")
     content_length: int = Field(description="Length of document content in characters")
     status: DocStatus = Field(description="Current processing status")
-    created_at: str = Field(description="Creation timestamp (ISO format string)")
-    updated_at: str = Field(description="Last update timestamp (ISO format string)")
-    track_id: Optional[str] = Field(
-        default=None, description="Tracking ID for monitoring progress"
+    created_at: datetime = Field(description="Creation timestamp")
+    updated_at: datetime = Field(description="Last update timestamp")
+    track_id: str | None = Field(
+        None, description="Tracking ID for monitoring progress"
     )
-    chunks_count: Optional[int] = Field(
-        default=None, description="Number of chunks the document was split into"
+    chunks_count: int | None = Field(
+        None, description="Number of chunks the document was split into"
     )
-    error_msg: Optional[str] = Field(
-        default=None, description="Error message if processing failed"
+    error_msg: str | None = Field(
+        None, description="Error message if processing failed"
     )
-    metadata: Optional[dict[str, Any]] = Field(
-        default=None, description="Additional metadata about the document"
+    metadata: dict[str, Any] | None = Field(
+        None, description="Additional metadata about the document"
     )
     file_path: str = Field(description="Path to the document file")
 
 
 class DocumentsListData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     documents: List[DocumentItem]
     total_documents: int
     collection_id: str
 
 
-class DocumentChunk(BaseModel):
-    id: str = Field(description="Chunk identifier")
-    content: str = Field(description="Chunk content")
-    document_id: str = Field(description="Parent document ID")
-    chunk_index: int = Field(description="Index of the chunk in the document")
-    metadata: Optional[dict[str, Any]] = Field(
-        default=None, description="Additional metadata about the chunk"
-    )
+@dataclass(slots=True, frozen=True)
+class DocumentChunk:
+    """文档分块（纯数据载体，不经过 pydantic 校验）"""
+
+    id: str
+    content: str
+    document_id: str
+    chunk_index: int
+    metadata: Optional[dict[str, Any]] = None
 
 
 class DocumentChunksData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     doc_id: str
     chunks: List[DocumentChunk]
     total_chunks: int
@@ -83,6 +94,8 @@ class DocumentChunksData(BaseModel):
 
 
 class DocumentUploadData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     filename: str
     file_size: Optional[int] = None
     file_type: Optional[str] = None
@@ -94,6 +107,8 @@ class DocumentUploadData(BaseModel):
 
 
 class BatchUploadItem(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     filename: str
     file_size: Optional[int] = None
     file_type: Optional[str] = None
@@ -103,6 +118,8 @@ class BatchUploadItem(BaseModel):
 
 
 class BatchUploadData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     batch_track_id: str  # 整个批次的统一track_id
     total_files: int
     successful_uploads: int
@@ -116,10 +133,12 @@ class BatchUploadData(BaseModel):
 
 
 class PipelineStatusData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     autoscanned: bool
     busy: bool
     job_name: str
-    job_start: Optional[str]
+    job_start: Optional[datetime] = None
     docs: int
     batchs: int
     cur_batch: int
@@ -129,25 +148,54 @@ class PipelineStatusData(BaseModel):
     update_status: Optional[dict]
     timestamp: datetime
 
+    @field_serializer("job_start")
+    def serialize_job_start(self, job_start: Optional[datetime]) -> Optional[datetime]:
+        # 只在序列化时补全时区（无时区按 UTC），格式与其他时间字段一致
+        if job_start is not None and job_start.tzinfo is None:
+            return job_start.replace(tzinfo=timezone.utc)
+        return job_start
+
 
 class TrackStatusData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     track_id: str
     documents: List[DocumentItem]
     total_count: int
     status_summary: Dict[str, int]
     timestamp: datetime
 
+    @classmethod
+    def from_documents(
+        cls, track_id: str, documents: List[DocumentItem], timestamp: datetime
+    ) -> "TrackStatusData":
+        """由已校验的文档列表构建，状态统计使用 Counter 一次完成"""
+        # 以枚举成员计数，最后只对少数几个不同状态取 .value
+        summary = Counter(doc.status for doc in documents)
+        return cls.model_construct(
+            track_id=track_id,
+            documents=documents,
+            total_count=len(documents),
+            status_summary={status.value: n for status, n in summary.items()},
+            timestamp=timestamp,
+        )
+
 
 class DocumentDeletionData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     operation_id: str
-    status: str
+    status: Literal["deletion_started", "busy", "not_allowed"]
     message: str
     affected_documents: List[str]
     files_to_delete: bool
+    track_id: Optional[str] = None  # 用于在 track_status 中查询删除结果
     timestamp: datetime
 
 
 class RetryDocumentData(BaseModel):
-    status: str
+    model_config = RESPONSE_CONFIG
+
+    status: Literal["started", "busy"]
     message: str
     timestamp: datetime
@@ -1,7 +1,10 @@
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
+from lightrag.api.schemas.common import RESPONSE_CONFIG
+
 
 class RelationUpdateRequest(BaseModel):
     source_id: str
@@ -16,17 +19,22 @@ class EntityUpdateRequest(BaseModel):
 
 
 class GraphLabelsData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     labels: List[str]
     total_labels: int
 
 
-class GraphNode(BaseModel):
+# 纯数据载体，量大且无需校验，使用 slots dataclass 代替 BaseModel
+@dataclass(slots=True, frozen=True)
+class GraphNode:
     id: str
     label: str
     properties: Dict[str, Any]
 
 
-class GraphEdge(BaseModel):
+@dataclass(slots=True, frozen=True)
+class GraphEdge:
     source: str
     target: str
     type: str
@@ -34,6 +42,8 @@ class GraphEdge(BaseModel):
 
 
 class GraphData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     nodes: List[GraphNode]
     edges: List[GraphEdge]
     total_nodes: int
@@ -44,6 +54,8 @@ class GraphData(BaseModel):
 
 
 class EntityExistsData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     exists: bool
     entity_name: str
     node_count: Optional[int] = None
@@ -52,6 +64,8 @@ class EntityExistsData(BaseModel):
 
 
 class EntityUpdateData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     entity_name: str
     updated_properties: Dict[str, Any]
     was_renamed: bool
@@ -61,6 +75,8 @@ class EntityUpdateData(BaseModel):
 
 
 class RelationUpdateData(BaseModel):
+    model_config = RESPONSE_CONFIG
+
     source_id: str
     target_id: str
     relation_type: str
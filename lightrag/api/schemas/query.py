@@ -4,6 +4,9 @@ from pydantic import BaseModel, Field, field_validator
 
 from lightrag.base import QueryParam
 
+# to_query_params 中不传给 QueryParam 的字段
+_QUERY_EXCLUDE = frozenset({"query"})
+
 
 class QueryResponse(BaseModel):
     entities: Optional[List[Dict[str, Any]]] = Field(
@@ -30,70 +33,70 @@ class QueryRequest(BaseModel):
         description="Query mode",
     )
 
-    only_need_context: Optional[bool] = Field(
-        default=None,
+    only_need_context: bool | None = Field(
+        None,
         description="If True, only returns the retrieved context without generating a response.",
     )
 
-    only_need_prompt: Optional[bool] = Field(
-        default=None,
+    only_need_prompt: bool | None = Field(
+        None,
         description="If True, only returns the generated prompt without producing a response.",
     )
 
-    response_type: Optional[str] = Field(
+    response_type: str | None = Field(
+        None,
         min_length=1,
-        default=None,
         description="Defines the response format. Examples: 'Multiple Paragraphs', 'Single Paragraph', 'Bullet Points'.",
     )
 
-    top_k: Optional[int] = Field(
+    top_k: int | None = Field(
+        None,
         ge=1,
-        default=None,
         description="Number of top items to retrieve. Represents entities in 'local' mode and relationships in 'global' mode.",
     )
 
-    chunk_top_k: Optional[int] = Field(
+    chunk_top_k: int | None = Field(
+        None,
         ge=1,
-        default=None,
         description="Number of text chunks to retrieve initially from vector search and keep after reranking.",
     )
 
-    max_entity_tokens: Optional[int] = Field(
-        default=None,
+    max_entity_tokens: int | None = Field(
+        None,
         description="Maximum number of tokens allocated for entity context in unified token control system.",
         ge=1,
     )
 
-    max_relation_tokens: Optional[int] = Field(
-        default=None,
+    max_relation_tokens: int | None = Field(
+        None,
         description="Maximum number of tokens allocated for relationship context in unified token control system.",
         ge=1,
     )
 
-    max_total_tokens: Optional[int] = Field(
-        default=None,
+    max_total_tokens: int | None = Field(
+        None,
         description="Maximum total tokens budget for the entire query context (entities + relations + chunks + system prompt).",
         ge=1,
     )
 
-    conversation_history: Optional[List[Dict[str, Any]]] = Field(
-        default=None,
+    conversation_history: List[Any] | None = Field(
+        None,
         description="Stores past conversation history to maintain context. Format: [{'role': 'user/assistant', 'content': 'message'}].",
     )
 
-    history_turns: Optional[int] = Field(
+    history_turns: int | None = Field(
+        None,
         ge=0,
-        default=None,
         description="Number of complete conversation turns (user-assistant pairs) to consider in the response context.",
     )
 
-    user_prompt: Optional[str] = Field(
-        default=None,
+    user_prompt: str | None = Field(
+        None,
         description="User-provided prompt for the query. If provided, this will be used instead of the default value from prompt template.",
     )
 
-    enable_rerank: Optional[bool] = Field(
-        default=None,
+    enable_rerank: bool | None = Field(
+        None,
         description="Enable reranking for retrieved text chunks. If True but no rerank model is configured, a warning will be issued. Default is True.",
     )
 
@@ -105,12 +108,16 @@ class QueryRequest(BaseModel):
     @field_validator("conversation_history", mode="after")
     @classmethod
     def conversation_history_role_check(
-        cls, conversation_history: List[Dict[str, Any]] | None
-    ) -> List[Dict[str, Any]] | None:
+        cls, conversation_history: List[Any] | None
+    ) -> List[Any] | None:
         if conversation_history is None:
             return None
+        # 条目类型为 Any，由这里唯一的一次遍历完成结构与角色校验
         for msg in conversation_history:
-            if "role" not in msg or msg["role"] not in {"user", "assistant"}:
+            if not isinstance(msg, dict) or msg.get("role") not in {
+                "user",
+                "assistant",
+            }:
                 raise ValueError(
                     "Each message must have a 'role' key with value 'user' or 'assistant'."
                 )
@@ -119,9 +126,7 @@ class QueryRequest(BaseModel):
     def to_query_params(self, is_stream: bool) -> "QueryParam":
         """Converts a QueryRequest instance into a QueryParam instance."""
         # Use Pydantic's `.model_dump(exclude_none=True)` to remove None values automatically
-        request_data = self.model_dump(exclude_none=True, exclude={"query"})
+        request_data = self.model_dump(exclude_none=True, exclude=_QUERY_EXCLUDE)
 
-        # Ensure `mode` and `stream` are set explicitly
-        param = QueryParam(**request_data)
-        param.stream = is_stream
-        return param
+        # QueryParam is a dataclass: pass `stream` through the constructor
+        return QueryParam(**request_data, stream=is_stream)
@@ -1,18 +1,19 @@
 """
 服务管理器 - 负责进程生命周期管理
 """
+import asyncio
 import os
+import heapq
 import signal
 import atexit
 import logging
 import threading
 import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import subprocess
-import psutil
 
 
 class ServiceState(Enum):
@@ -36,27 +37,53 @@ class ServiceInfo:
     active_tasks: List[str] = field(default_factory=list)
 
 
+# 单个任务的最长运行时间（秒），超过后在关闭时视为超时
+TASK_TIMEOUT = 300
+# get_service_info 结果的缓存时间（秒）
+SERVICE_INFO_TTL = 1.0
+# 关闭时轮询子进程退出状态的间隔（秒）
+SUBPROCESS_POLL_INTERVAL = 0.05
+
+
 class ServiceManager:
     """服务管理器 - 负责优雅关闭和资源管理"""
 
     def __init__(self):
         self.state = ServiceState.INITIALIZING
         self.start_time = datetime.now()
+        # 单调时钟起点，uptime/关闭耗时据此计算，不受系统时间调整影响
+        self._start_monotonic = time.monotonic()
         self.stop_time = None
         self.shutdown_requested = False
-        self.shutdown_callbacks: List[Callable] = []
-        self.cleanup_lock = threading.RLock()
-        self.processes: List[subprocess.Popen] = []
-        self.threads: List[threading.Thread] = []
+        # (name, callback)：名称在注册时确定，关闭时无需再反射取 __name__
+        self.shutdown_callbacks: List[Tuple[str, Callable]] = []
+        # 注册表按 pid / 对象 id 建索引，注销为 O(1)
+        self.processes: Dict[int, subprocess.Popen] = {}
+        self.threads: Dict[int, threading.Thread] = {}
         self.logger = logging.getLogger(__name__)
         self.error_message = None
 
         # 服务统计信息
         self.total_requests = 0
         self.active_connections = 0
-        self.active_tasks: Dict[str, datetime] = {}
+        # task_id -> 开始时间 (time.monotonic())
+        self.active_tasks: Dict[str, float] = {}
+        # (超时截止时间, task_id) 小顶堆，按截止时间惰性清理超时任务
+        self._task_heap: List[Tuple[float, str]] = []
+        # 无活跃任务时置位，关闭流程据此被唤醒而不是轮询
+        self._tasks_idle = threading.Event()
+        self._tasks_idle.set()
+
+        # psutil.Process 句柄在首次使用时创建并复用，见 _get_process
+        self._process = None
+        # (生成时间 monotonic, 服务信息)，短 TTL 内直接复用
+        self._info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
 
         # 设置信号处理器
+        self._signal_event = threading.Event()
+        self._received_signal: Optional[int] = None
+        self._signal_thread: Optional[threading.Thread] = None
+        self._shutdown_future: Optional[asyncio.Future] = None
         self._setup_signal_handlers()
 
         # 注册清理函数
@@ -73,12 +100,27 @@ class ServiceManager:
         try:
             signal.signal(signal.SIGINT, self._signal_handler)
             signal.signal(signal.SIGTERM, self._signal_handler)
-            self.logger.info("Signal handlers set up successfully")
         except ValueError as e:
             self.logger.warning(f"Failed to set up signal handlers: {e}")
+            return
+
+        # 信号处理器只做记录和唤醒，日志与关闭流程放在专用线程中执行
+        watcher = threading.Thread(
+            target=self._signal_watch_loop, name="signal-watcher", daemon=True
+        )
+        watcher.start()
+        self._signal_thread = watcher
+        self.logger.info("Signal handlers set up successfully")
 
     def _signal_handler(self, signum, frame):
-        """信号处理器"""
+        """信号处理器：不加锁、不写日志，只记录信号并唤醒监视线程"""
+        self._received_signal = signum
+        self._signal_event.set()
+
+    def _signal_watch_loop(self):
+        """等待信号事件，在普通线程上下文中发起优雅关闭"""
+        self._signal_event.wait()
+        signum = self._received_signal
         self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
         self.initiate_shutdown(f"Signal {signum} received")
 
@@ -98,7 +140,23 @@ class ServiceManager:
         self.state = ServiceState.STOPPING
         self.logger.info(f"Initiating graceful shutdown: {reason}")
 
-        # 在新线程中执行关闭，避免阻塞信号处理
+        # 信号监视线程本身就是专用线程，直接在其中执行关闭
+        if threading.current_thread() is self._signal_thread:
+            self._graceful_shutdown(reason)
+            return
+
+        # 在事件循环中调用时交给默认线程池，避免阻塞事件循环
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            self._shutdown_future = loop.run_in_executor(
+                None, self._graceful_shutdown, reason
+            )
+            return
+
+        # 其他情况在新线程中执行关闭，避免阻塞调用方
         shutdown_thread = threading.Thread(target=self._graceful_shutdown, args=(reason,))
         shutdown_thread.daemon = True
         shutdown_thread.start()
@@ -115,24 +173,27 @@ class ServiceManager:
             # 2. 等待活跃任务完成
             self._wait_for_active_tasks()
 
-            # 3. 调用关闭回调
+            # 3. 先向所有子进程发送 SIGTERM，使其退出与关闭回调并行进行
+            self._terminate_subprocesses()
+
+            # 4. 调用关闭回调
             self._call_shutdown_callbacks()
 
-            # 4. 停止子进程
+            # 5. 在统一的截止时间内回收子进程
             self._stop_subprocesses()
 
-            # 5. 停止线程
+            # 6. 停止线程
             self._stop_threads()
 
-            # 6. 清理资源
+            # 7. 清理资源
             self._cleanup_resources()
 
-            # 7. 更新状态
+            # 8. 更新状态
             self.state = ServiceState.STOPPED
             self.stop_time = datetime.now()
 
             # 记录关闭统计
-            duration = (self.stop_time - self.start_time).total_seconds()
+            duration = time.monotonic() - self._start_monotonic
             self.logger.info(f"Graceful shutdown completed in {duration:.2f} seconds")
             self.logger.info(f"Total requests handled: {self.total_requests}")
 
@@ -149,21 +210,26 @@ class ServiceManager:
 
         self.logger.info(f"Waiting for {len(self.active_tasks)} active tasks to complete...")
 
-        start_time = time.time()
-        while self.active_tasks and time.time() - start_time < timeout:
-            # 清理已完成的任务
-            current_time = datetime.now()
-            completed_tasks = [
-                task_id for task_id, start_time in self.active_tasks.items()
-                if (current_time - start_time).total_seconds() > 300  # 5分钟超时
-            ]
-
-            for task_id in completed_tasks:
-                self.active_tasks.pop(task_id, None)
-                self.logger.warning(f"Task {task_id} timed out, removing from active tasks")
-
-            if self.active_tasks:
-                time.sleep(0.5)
+        wait_deadline = time.monotonic() + timeout
+        while self.active_tasks:
+            # 只弹出已到期的堆顶，无需遍历全部任务
+            now = time.monotonic()
+            while self._task_heap and self._task_heap[0][0] <= now:
+                deadline, task_id = heapq.heappop(self._task_heap)
+                # 惰性删除：任务已完成或已重新开始时，堆中条目已过期
+                started = self.active_tasks.get(task_id)
+                if started is not None and started + TASK_TIMEOUT == deadline:
+                    self.active_tasks.pop(task_id, None)
+                    self.logger.warning(f"Task {task_id} timed out, removing from active tasks")
+
+            if not self.active_tasks or now >= wait_deadline:
+                break
+
+            # 阻塞到最后一个任务完成、下一个任务超时或整体超时，三者取最早
+            wake_at = wait_deadline
+            if self._task_heap:
+                wake_at = min(wake_at, self._task_heap[0][0])
+            self._tasks_idle.wait(wake_at - now)
 
         if self.active_tasks:
             self.logger.warning(f"Timeout reached, {len(self.active_tasks)} tasks still active")
@@ -177,32 +243,61 @@ class ServiceManager:
 
         self.logger.info(f"Calling {len(self.shutdown_callbacks)} shutdown callbacks...")
 
-        for callback in self.shutdown_callbacks:
+        for name, callback in self.shutdown_callbacks:
             try:
                 callback()
-                self.logger.debug(f"Shutdown callback {callback.__name__} executed successfully")
+                self.logger.debug(f"Shutdown callback {name} executed successfully")
             except Exception as e:
-                self.logger.error(f"Error in shutdown callback {callback.__name__}: {e}")
+                self.logger.error(f"Error in shutdown callback {name}: {e}")
 
-    def _stop_subprocesses(self, timeout: int = 10):
-        """停止子进程"""
+    def _terminate_subprocesses(self):
+        """向所有仍在运行的子进程发送 SIGTERM（不等待）"""
+        for process in list(self.processes.values()):
+            try:
+                if process.poll() is None:  # 进程仍在运行
+                    process.terminate()  # 发送SIGTERM
+            except Exception as e:
+                self.logger.error(f"Error terminating subprocess {getattr(process, 'pid', 'unknown')}: {e}")
+
+    def _stop_subprocesses(self, timeout: int = 5):
+        """停止子进程：SIGTERM 已统一发出，这里在共享截止时间内等待，超时者强制结束"""
         if not self.processes:
             return
 
         self.logger.info(f"Stopping {len(self.processes)} subprocesses...")
 
-        for process in self.processes:
-            try:
-                if process.poll() is None:  # 进程仍在运行
-                    process.terminate()  # 发送SIGTERM
-                    try:
-                        process.wait(timeout=5)
+        # 兜底：确保所有子进程都已收到 SIGTERM
+        self._terminate_subprocesses()
+
+        # 轮询所有子进程直到全部退出或截止时间到，poll() 不阻塞
+        deadline = time.monotonic() + timeout
+        pending = list(self.processes.values())
+        while pending:
+            still_running = []
+            for process in pending:
+                try:
+                    if process.poll() is None:
+                        still_running.append(process)
+                    else:
                         self.logger.debug(f"Subprocess {process.pid} terminated gracefully")
-                    except subprocess.TimeoutExpired:
-                        self.logger.warning(f"Subprocess {process.pid} did not terminate, killing...")
-                        process.kill()  # 发送SIGKILL
-                        process.wait()
-                        self.logger.debug(f"Subprocess {process.pid} killed")
+                except Exception as e:
+                    self.logger.error(f"Error stopping subprocess {getattr(process, 'pid', 'unknown')}: {e}")
+            pending = still_running
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(SUBPROCESS_POLL_INTERVAL)
+
+        # 超时仍未退出的子进程：统一 SIGKILL 后回收
+        for process in pending:
+            try:
+                self.logger.warning(f"Subprocess {process.pid} did not terminate, killing...")
+                process.kill()  # 发送SIGKILL
+            except Exception as e:
+                self.logger.error(f"Error killing subprocess {getattr(process, 'pid', 'unknown')}: {e}")
+        for process in pending:
+            try:
+                process.wait()
+                self.logger.debug(f"Subprocess {process.pid} killed")
             except Exception as e:
                 self.logger.error(f"Error stopping subprocess {getattr(process, 'pid', 'unknown')}: {e}")
 
@@ -215,7 +310,7 @@ class ServiceManager:
 
         self.logger.info(f"Stopping {len(self.threads)} threads...")
 
-        for thread in self.threads:
+        for thread in list(self.threads.values()):
             if thread.is_alive() and thread != threading.current_thread():
                 # 注意：Python中没有安全的方式强制停止线程
                 # 这里只是记录日志，线程应该通过事件等方式自行退出
@@ -223,6 +318,15 @@ class ServiceManager:
 
         self.threads.clear()
 
+    def _get_process(self):
+        """延迟导入 psutil 并创建 Process 句柄；首次调用 cpu_percent 仅用于建立采样基线"""
+        if self._process is None:
+            import psutil
+
+            self._process = psutil.Process()
+            self._process.cpu_percent(None)
+        return self._process
+
     def _cleanup_resources(self):
         """清理资源"""
         try:
@@ -231,8 +335,7 @@ class ServiceManager:
             gc.collect()
 
             # 记录内存使用情况
-            process = psutil.Process()
-            memory_info = process.memory_info()
+            memory_info = self._get_process().memory_info()
             self.logger.info(f"Memory usage before cleanup: {memory_info.rss / 1024 / 1024:.2f} MB")
 
         except Exception as e:
@@ -244,7 +347,7 @@ class ServiceManager:
 
         try:
             # 强制停止所有子进程
-            for process in self.processes:
+            for process in list(self.processes.values()):
                 try:
                     if process.poll() is None:
                         process.kill()
@@ -255,6 +358,8 @@ class ServiceManager:
             self.processes.clear()
             self.threads.clear()
             self.active_tasks.clear()
+            self._task_heap.clear()
+            self._tasks_idle.set()
 
         except Exception as e:
             self.logger.error(f"Error during emergency cleanup: {e}")
@@ -262,39 +367,45 @@ class ServiceManager:
     # 公共API方法
     def register_shutdown_callback(self, callback: Callable):
         """注册关闭回调函数"""
-        self.shutdown_callbacks.append(callback)
-        self.logger.debug(f"Shutdown callback registered: {callback.__name__}")
+        name = getattr(callback, "__name__", None) or repr(callback)
+        if name == "<lambda>":
+            name = repr(callback)
+        self.shutdown_callbacks.append((name, callback))
+        self.logger.debug(f"Shutdown callback registered: {name}")
 
     def register_subprocess(self, process: subprocess.Popen):
         """注册子进程以便管理"""
-        self.processes.append(process)
+        self.processes[process.pid] = process
         self.logger.debug(f"Subprocess registered: {process.pid}")
 
     def unregister_subprocess(self, process: subprocess.Popen):
         """取消注册子进程"""
-        if process in self.processes:
-            self.processes.remove(process)
+        if self.processes.pop(process.pid, None) is not None:
             self.logger.debug(f"Subprocess unregistered: {getattr(process, 'pid', 'unknown')}")
 
     def register_thread(self, thread: threading.Thread):
         """注册线程以便管理"""
-        self.threads.append(thread)
+        self.threads[id(thread)] = thread
         self.logger.debug(f"Thread registered: {thread.name}")
 
     def unregister_thread(self, thread: threading.Thread):
         """取消注册线程"""
-        if thread in self.threads:
-            self.threads.remove(thread)
+        if self.threads.pop(id(thread), None) is not None:
             self.logger.debug(f"Thread unregistered: {thread.name}")
 
     def start_task(self, task_id: str):
         """开始一个任务"""
-        self.active_tasks[task_id] = datetime.now()
+        started = time.monotonic()
+        self.active_tasks[task_id] = started
+        heapq.heappush(self._task_heap, (started + TASK_TIMEOUT, task_id))
+        self._tasks_idle.clear()
         self.logger.debug(f"Task started: {task_id}")
 
     def finish_task(self, task_id: str):
         """完成一个任务"""
         self.active_tasks.pop(task_id, None)
+        if not self.active_tasks:
+            self._tasks_idle.set()
         self.logger.debug(f"Task finished: {task_id}")
 
     def increment_connections(self):
@@ -308,14 +419,18 @@ class ServiceManager:
 
     def get_service_info(self) -> Dict[str, Any]:
         """获取服务信息"""
+        now = time.monotonic()
+        if self._info_cache is not None and now - self._info_cache[0] < SERVICE_INFO_TTL:
+            return self._info_cache[1]
+
         try:
-            process = psutil.Process()
+            process = self._get_process()
             memory_info = process.memory_info()
-            cpu_percent = process.cpu_percent()
+            cpu_percent = process.cpu_percent(None)
 
-            return {
+            info = {
                 "state": self.state.value,
-                "uptime": (datetime.now() - self.start_time).total_seconds(),
+                "uptime": now - self._start_monotonic,
                 "pid": os.getpid(),
                 "total_requests": self.total_requests,
                 "active_connections": self.active_connections,
@@ -327,6 +442,8 @@ class ServiceManager:
                 "shutdown_requested": self.shutdown_requested,
                 "error_message": getattr(self, 'error_message', None)
             }
+            self._info_cache = (now, info)
+            return info
         except Exception as e:
             self.logger.error(f"Error getting service info: {e}")
             return {"error": str(e)}
@@ -339,6 +456,7 @@ class ServiceManager:
         """将服务状态设置为运行中"""
         self.state = ServiceState.RUNNING
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
         self.logger.info("Service state set to RUNNING")
 
     def set_error(self, error_message: str):
@@ -1,25 +1,48 @@
-from datetime import datetime
+import asyncio
+import os
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
 import traceback
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 from lightrag.api.utils.file import pipeline_enqueue_file
-from lightrag.document_manager import DocumentManager
-from lightrag.lightrag import LightRAG
+from lightrag.config_manager import get_app_config
+from lightrag.kg.shared_storage import get_namespace_data, get_pipeline_status_lock
 from lightrag.utils import logger
 
+if TYPE_CHECKING:
+    from lightrag.document_manager import DocumentManager
+    from lightrag.lightrag import LightRAG
+
+# 批量入队时同时进行的 pipeline_enqueue_file 数量上限
+ENQUEUE_CONCURRENCY = 8
+# history_messages 超过上限时只保留最近的若干条，与 pipeline 处理保持一致
+HISTORY_MESSAGES_LIMIT = 10000
+HISTORY_MESSAGES_KEEP = 5000
+# DeleteBatcher 保留结果的 track_id 数量上限
+DELETE_RESULTS_LIMIT = 1000
+
+
+def _append_history(pipeline_status: dict, messages: List[str]):
+    """追加历史消息并原地裁剪，调用方需持有 pipeline_status_lock 或 busy 标志"""
+    history_messages = pipeline_status["history_messages"]
+    history_messages.extend(messages)
+    if len(history_messages) > HISTORY_MESSAGES_LIMIT:
+        del history_messages[:-HISTORY_MESSAGES_KEEP]
+
 
 async def background_delete_documents(
-    rag: LightRAG,
-    doc_manager: DocumentManager,
+    rag: "LightRAG",
+    doc_manager: "DocumentManager",
     doc_ids: List[str],
     delete_file: bool = False,
-):
-    """Background task to delete multiple documents"""
-    from lightrag.kg.shared_storage import (
-        get_namespace_data,
-        get_pipeline_status_lock,
-    )
+) -> Optional[Tuple[List[str], List[str]]]:
+    """Background task to delete multiple documents
 
+    Returns:
+        (successful doc ids, failed doc ids), or None if the pipeline was busy
+        and nothing was deleted
+    """
     pipeline_status = await get_namespace_data("pipeline_status")
     pipeline_status_lock = get_pipeline_status_lock()
 
@@ -31,33 +54,49 @@ async def background_delete_documents(
     async with pipeline_status_lock:
         if pipeline_status.get("busy", False):
             logger.warning("Error: Unexpected pipeline busy state, aborting deletion.")
-            return  # Abort deletion operation
+            return None  # Abort deletion operation
 
         # Set pipeline status to busy for deletion
         pipeline_status.update(
             {
                 "busy": True,
                 "job_name": f"Deleting {total_docs} Documents",
-                "job_start": datetime.now().isoformat(),
+                "job_start": datetime.now(timezone.utc).isoformat(),
                 "docs": total_docs,
                 "batchs": total_docs,
                 "cur_batch": 0,
                 "latest_message": "Starting document deletion process",
             }
         )
-        # Use slice assignment to clear the list in place
-        pipeline_status["history_messages"][:] = ["Starting document deletion process"]
+        # 原地清空：history_messages 可能是 Manager.list 共享对象（没有 clear()），不能重新赋值
+        history_messages = pipeline_status["history_messages"]
+        del history_messages[:]
+        history_messages.append("Starting document deletion process")
+
+    # __enqueued__ 目录只扫描一次，按扩展名建立索引，避免每个文档各做一次 glob
+    input_dir = str(doc_manager.input_dir)
+    enqueued_dir = os.path.join(input_dir, "__enqueued__")
+    enqueued_index: Optional[Dict[str, Set[str]]] = None
+    if delete_file and os.path.isdir(enqueued_dir):
+        enqueued_index = {}
+        with os.scandir(enqueued_dir) as it:
+            for entry in it:
+                suffix = os.path.splitext(entry.name)[1]
+                enqueued_index.setdefault(suffix, set()).add(entry.name)
 
     try:
         # Loop through each document ID and delete them one by one
         for i, doc_id in enumerate(doc_ids, 1):
-            async with pipeline_status_lock:
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
-                logger.info(start_msg)
-                pipeline_status["cur_batch"] = i
-                pipeline_status["latest_message"] = start_msg
-                pipeline_status["history_messages"].append(start_msg)
+            # busy 标志由本任务持有，期间 pipeline 不会写入状态，单条更新无需再加锁；
+            # 锁只保留给 busy 检查、初始化和收尾这些复合更新
+            start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
+            logger.info(start_msg)
+            pipeline_status["cur_batch"] = i
+            pipeline_status["latest_message"] = start_msg
+            pipeline_status["history_messages"].append(start_msg)
 
+            # 本文档产生的状态消息先在本地收集，处理结束后一次性写入 pipeline_status
+            doc_msgs: List[str] = []
             file_path = "#"
             try:
                 result = await rag.adelete_by_doc_id(doc_id)
@@ -66,88 +105,91 @@ async def background_delete_documents(
                     successful_deletions.append(doc_id)
                     success_msg = f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
                     logger.info(success_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["history_messages"].append(success_msg)
+                    doc_msgs.append(success_msg)
 
                     # Handle file deletion if requested and file_path is available
                     if delete_file and result.file_path and result.file_path != "unknown_source":
                         try:
                             deleted_files = []
                             # check and delete files from input_dir directory
-                            file_path = doc_manager.input_dir / result.file_path
-                            if file_path.exists():
-                                try:
-                                    file_path.unlink()
-                                    deleted_files.append(file_path.name)
-                                    file_delete_msg = f"Successfully deleted input_dir file: {result.file_path}"
-                                    logger.info(file_delete_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = file_delete_msg
-                                        pipeline_status["history_messages"].append(file_delete_msg)
-                                except Exception as file_error:
-                                    file_error_msg = (
-                                        f"Failed to delete input_dir file {result.file_path}: {str(file_error)}"
-                                    )
-                                    logger.debug(file_error_msg)
-                                    async with pipeline_status_lock:
-                                        pipeline_status["latest_message"] = file_error_msg
-                                        pipeline_status["history_messages"].append(file_error_msg)
+                            file_path = os.path.join(input_dir, result.file_path)
+                            try:
+                                os.unlink(file_path)
+                                deleted_files.append(os.path.basename(file_path))
+                                file_delete_msg = f"Successfully deleted input_dir file: {result.file_path}"
+                                logger.info(file_delete_msg)
+                                doc_msgs.append(file_delete_msg)
+                            except FileNotFoundError:
+                                pass
+                            except Exception as file_error:
+                                file_error_msg = (
+                                    f"Failed to delete input_dir file {result.file_path}: {str(file_error)}"
+                                )
+                                logger.debug(file_error_msg)
+                                doc_msgs.append(file_error_msg)
 
                             # Also check and delete files from __enqueued__ directory
-                            enqueued_dir = doc_manager.input_dir / "__enqueued__"
-                            if enqueued_dir.exists():
+                            if enqueued_index is not None:
                                 # Look for files with the same name or similar names (with numeric suffixes)
-                                base_name = Path(result.file_path).stem
-                                extension = Path(result.file_path).suffix
+                                base_name, extension = os.path.splitext(
+                                    os.path.basename(result.file_path)
+                                )
+                                # 无扩展名时等价于 glob("{base}*")，需检查所有分组
+                                groups = (
+                                    [enqueued_index.get(extension, set())]
+                                    if extension
+                                    else list(enqueued_index.values())
+                                )
+                                matches = [
+                                    (group, name)
+                                    for group in groups
+                                    for name in group
+                                    if name.startswith(base_name)
+                                    and len(name) >= len(base_name) + len(extension)
+                                ]
 
-                                # Search for exact match and files with numeric suffixes
-                                for enqueued_file in enqueued_dir.glob(f"{base_name}*{extension}"):
+                                # Exact match and files with numeric suffixes
+                                for group, name in matches:
                                     try:
-                                        enqueued_file.unlink()
-                                        deleted_files.append(enqueued_file.name)
-                                        logger.info(f"Successfully deleted enqueued file: {enqueued_file.name}")
+                                        os.unlink(os.path.join(enqueued_dir, name))
+                                        group.discard(name)
+                                        deleted_files.append(name)
+                                        logger.info("Successfully deleted enqueued file: %s", name)
                                     except Exception as enqueued_error:
-                                        file_error_msg = f"Failed to delete enqueued file {enqueued_file.name}: {str(enqueued_error)}"
+                                        file_error_msg = f"Failed to delete enqueued file {name}: {str(enqueued_error)}"
                                         logger.debug(file_error_msg)
-                                        async with pipeline_status_lock:
-                                            pipeline_status["latest_message"] = file_error_msg
-                                            pipeline_status["history_messages"].append(file_error_msg)
+                                        doc_msgs.append(file_error_msg)
 
                             if deleted_files == []:
                                 file_error_msg = f"File deletion skipped, missing file: {result.file_path}"
                                 logger.warning(file_error_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = file_error_msg
-                                    pipeline_status["history_messages"].append(file_error_msg)
+                                doc_msgs.append(file_error_msg)
 
                         except Exception as file_error:
                             file_error_msg = f"Failed to delete file {result.file_path}: {str(file_error)}"
                             logger.error(file_error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = file_error_msg
-                                pipeline_status["history_messages"].append(file_error_msg)
+                            doc_msgs.append(file_error_msg)
                     elif delete_file:
                         no_file_msg = f"File deletion skipped, missing file path: {doc_id}"
                         logger.warning(no_file_msg)
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = no_file_msg
-                            pipeline_status["history_messages"].append(no_file_msg)
+                        doc_msgs.append(no_file_msg)
                 else:
                     failed_deletions.append(doc_id)
                     error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
                     logger.error(error_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["latest_message"] = error_msg
-                        pipeline_status["history_messages"].append(error_msg)
+                    doc_msgs.append(error_msg)
 
             except Exception as e:
                 failed_deletions.append(doc_id)
                 error_msg = f"Error deleting document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
                 logger.error(error_msg)
                 logger.error(traceback.format_exc())
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = error_msg
-                    pipeline_status["history_messages"].append(error_msg)
+                doc_msgs.append(error_msg)
+
+            finally:
+                if doc_msgs:
+                    pipeline_status["latest_message"] = doc_msgs[-1]
+                    _append_history(pipeline_status, doc_msgs)
 
     except Exception as e:
         error_msg = f"Critical error during batch deletion: {str(e)}"
@@ -176,66 +218,250 @@ async def background_delete_documents(
             except Exception as e:
                 logger.error(f"Error processing pending documents after deletion: {e}")
 
+    return successful_deletions, failed_deletions
 
-async def pipeline_index_file(rag: LightRAG, file_path: Path, track_id: str = None):
-    """Index a file with track_id
 
-    Args:
-        rag: LightRAG instance
-        file_path: Path to the saved file
-        track_id: Optional tracking ID
-    """
-    try:
-        success, returned_track_id = await pipeline_enqueue_file(rag, file_path, track_id)
-        if success:
-            await rag.apipeline_process_enqueue_documents()
+async def _enqueue_files(
+    rag: "LightRAG", items: List[Tuple[Path, str]]
+) -> Tuple[List[Path], List[Path]]:
+    """并发将 (file_path, track_id) 加入队列，信号量限制同时进行的入队数量
 
-    except Exception as e:
-        logger.exception("Error indexing file %s: %s", file_path.name, e)
+    Returns:
+        tuple: (successful_files, failed_files)
+    """
+    successful_files = []
+    failed_files = []
+    sem = asyncio.Semaphore(ENQUEUE_CONCURRENCY)
 
+    async def _enqueue_one(file_path: Path, track_id: str) -> bool:
+        async with sem:
+            success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
+            return success
 
-async def pipeline_index_files_batch(rag: LightRAG, file_paths: List[Path], batch_track_id: str):
-    """批量索引文件，避免pipeline竞争
+    results = await asyncio.gather(
+        *(_enqueue_one(file_path, track_id) for file_path, track_id in items),
+        return_exceptions=True,
+    )
 
-    Args:
-        rag: LightRAG instance
-        file_paths: List of file paths to index
-        batch_track_id: Batch tracking ID
-    """
-    # from lightrag.kg.shared_storage import get_namespace_data, get_pipeline_status_lock
+    for (file_path, _), result in zip(items, results):
+        if isinstance(result, BaseException):
+            failed_files.append(file_path)
+            logger.error(
+                "Error enqueuing file %s: %s",
+                file_path.name,
+                result,
+                exc_info=result,
+            )
+        elif result:
+            successful_files.append(file_path)
+            logger.info("Successfully enqueued file: %s", file_path.name)
+        else:
+            failed_files.append(file_path)
+            logger.error(f"Failed to enqueue file: {file_path.name}")
 
-    # pipeline_status = await get_namespace_data("pipeline_status")
-    # pipeline_status_lock = get_pipeline_status_lock()
+    return successful_files, failed_files
 
-    successful_files = []
-    failed_files = []
 
+async def _index_items(rag: "LightRAG", items: List[Tuple[Path, str]]):
+    """先将全部文件加入队列，再一次性启动pipeline处理"""
     try:
-        # 第一步：将所有文件加入队列
-        for file_path in file_paths:
-            try:
-                success, _ = await pipeline_enqueue_file(rag, file_path, batch_track_id)
-                if success:
-                    successful_files.append(file_path)
-                    logger.info(f"Successfully enqueued file: {file_path.name}")
-                else:
-                    failed_files.append(file_path)
-                    logger.error(f"Failed to enqueue file: {file_path.name}")
-            except Exception as e:
-                failed_files.append(file_path)
-                logger.exception("Error enqueuing file %s: %s", file_path.name, e)
+        successful_files, failed_files = await _enqueue_files(rag, items)
 
-        # 第二步：一次性启动pipeline处理
         if successful_files:
             try:
                 # Let apipeline_process_enqueue_documents handle status and locking
                 await rag.apipeline_process_enqueue_documents()
-                logger.info(f"Batch processing initiated for {len(successful_files)} files")
+                logger.info("Batch processing initiated for %d files", len(successful_files))
 
             except Exception as e:
                 logger.exception("Error during batch pipeline processing: %s", e)
 
-        logger.info(f"Batch indexing completed: {len(successful_files)} successful, {len(failed_files)} failed")
+        logger.info(
+            "Batch indexing completed: %d successful, %d failed",
+            len(successful_files),
+            len(failed_files),
+        )
 
     except Exception as e:
         logger.exception("Error during batch file indexing: %s", e)
+
+
+class IndexBatcher:
+    """按集合合并上传触发的索引请求
+
+    第一个文件到达后开启一个防抖窗口，窗口内（或攒满 max_batch_size 个）到达的文件
+    合并为一批，只运行一次 apipeline_process_enqueue_documents。
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        # 未显式指定时每次从配置读取，便于运行时调整
+        self._debounce_seconds = debounce_seconds
+        self._max_batch_size = max_batch_size
+        self._pending: Dict[str, Tuple["LightRAG", List[Tuple[Path, str]]]] = {}
+        self._full: Dict[str, asyncio.Event] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+    @property
+    def debounce_seconds(self) -> float:
+        if self._debounce_seconds is not None:
+            return self._debounce_seconds
+        return get_app_config().lightrag_config.INDEX_DEBOUNCE_SECONDS
+
+    @property
+    def max_batch_size(self) -> int:
+        if self._max_batch_size is not None:
+            return self._max_batch_size
+        return get_app_config().lightrag_config.INDEX_MAX_BATCH_SIZE
+
+    def submit(
+        self, collection_id: str, rag: "LightRAG", file_path: Path, track_id: str
+    ):
+        """登记待索引文件；必须在事件循环中调用"""
+        self.submit_many(collection_id, rag, [(file_path, track_id)])
+
+    def submit_many(
+        self, collection_id: str, rag: "LightRAG", items: List[Tuple[Path, str]]
+    ):
+        """登记一组 (file_path, track_id)，由该集合唯一的后台 worker 处理"""
+        _, pending = self._pending.get(collection_id, (rag, []))
+        pending.extend(items)
+        # 使用最新的 rag 实例处理整批
+        self._pending[collection_id] = (rag, pending)
+
+        full = self._full.setdefault(collection_id, asyncio.Event())
+        if len(pending) >= self.max_batch_size:
+            full.set()
+
+        if collection_id not in self._workers:
+            self._workers[collection_id] = asyncio.create_task(
+                self._run(collection_id)
+            )
+
+    async def _run(self, collection_id: str):
+        full = self._full[collection_id]
+        try:
+            while self._pending.get(collection_id):
+                try:
+                    await asyncio.wait_for(full.wait(), timeout=self.debounce_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                full.clear()
+
+                # 每批最多 max_batch_size 个文件，其余留到下一批
+                rag, items = self._pending.pop(collection_id)
+                max_batch_size = self.max_batch_size
+                if len(items) > max_batch_size:
+                    rest = items[max_batch_size:]
+                    self._pending[collection_id] = (rag, rest)
+                    items = items[:max_batch_size]
+                    if len(rest) >= max_batch_size:
+                        full.set()
+                logger.info(
+                    "Indexing %d uploaded file(s) for collection %s",
+                    len(items),
+                    collection_id,
+                )
+                await _index_items(rag, items)
+        finally:
+            self._workers.pop(collection_id, None)
+
+
+class DeleteBatcher:
+    """按集合合并删除请求
+
+    合并窗口内到达的删除请求只运行一次 background_delete_documents
+    （delete_file 取值不同的文档分为两批依次执行），同一集合同时只有一个删除任务，
+    避免多个后台任务相互因 busy 标志而中止。busy 检查在实际执行时进行，
+    每个文档的结果按提交时的 track_id 记录，供 track_status 查询。
+    """
+
+    def __init__(self, debounce_seconds: Optional[float] = None):
+        self._debounce_seconds = debounce_seconds
+        self._pending: Dict[
+            str,
+            Tuple["LightRAG", "DocumentManager", Dict[bool, List[Tuple[str, str]]]],
+        ] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        # track_id -> {doc_id: 状态}，只保留最近 DELETE_RESULTS_LIMIT 个
+        self._results: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+    @property
+    def debounce_seconds(self) -> float:
+        if self._debounce_seconds is not None:
+            return self._debounce_seconds
+        return get_app_config().lightrag_config.DELETE_DEBOUNCE_SECONDS
+
+    def get_result(self, track_id: str) -> Optional[Dict[str, str]]:
+        """每个文档的删除状态：pending / deleted / failed / busy"""
+        result = self._results.get(track_id)
+        return dict(result) if result is not None else None
+
+    def submit(
+        self,
+        collection_id: str,
+        rag: "LightRAG",
+        doc_manager: "DocumentManager",
+        doc_ids: List[str],
+        delete_file: bool,
+        track_id: str,
+    ):
+        """登记待删除文档；必须在事件循环中调用"""
+        self._results[track_id] = {doc_id: "pending" for doc_id in doc_ids}
+        if len(self._results) > DELETE_RESULTS_LIMIT:
+            self._results.popitem(last=False)
+
+        _, _, pending = self._pending.get(collection_id, (rag, doc_manager, {}))
+        pending.setdefault(delete_file, []).extend(
+            (doc_id, track_id) for doc_id in doc_ids
+        )
+        self._pending[collection_id] = (rag, doc_manager, pending)
+
+        if collection_id not in self._workers:
+            self._workers[collection_id] = asyncio.create_task(
+                self._run(collection_id)
+            )
+
+    def _set_state(self, items: List[Tuple[str, str]], states: Dict[str, str]):
+        for doc_id, track_id in items:
+            result = self._results.get(track_id)
+            if result is not None:
+                result[doc_id] = states.get(doc_id, "failed")
+
+    async def _run(self, collection_id: str):
+        try:
+            while collection_id in self._pending:
+                if self.debounce_seconds > 0:
+                    await asyncio.sleep(self.debounce_seconds)
+                rag, doc_manager, pending = self._pending.pop(collection_id)
+                for delete_file, items in pending.items():
+                    # 去重并保持提交顺序
+                    doc_ids = list(dict.fromkeys(doc_id for doc_id, _ in items))
+                    logger.info(
+                        "Deleting %d document(s) for collection %s",
+                        len(doc_ids),
+                        collection_id,
+                    )
+                    try:
+                        outcome = await background_delete_documents(
+                            rag, doc_manager, doc_ids, delete_file
+                        )
+                    except Exception:
+                        logger.exception(
+                            "Error deleting documents for collection %s", collection_id
+                        )
+                        outcome = ([], doc_ids)
+
+                    if outcome is None:
+                        # 执行时 pipeline 正忙，未删除任何文档
+                        states = {doc_id: "busy" for doc_id in doc_ids}
+                    else:
+                        successful, failed = outcome
+                        states = {doc_id: "deleted" for doc_id in successful}
+                        states.update((doc_id, "failed") for doc_id in failed)
+                    self._set_state(items, states)
+        finally:
+            self._workers.pop(collection_id, None)
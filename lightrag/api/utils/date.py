@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Optional
 
 
@@ -24,3 +25,25 @@ def format_datetime(dt: Any) -> Optional[str]:
 
     # Return ISO format string with timezone information
     return dt.isoformat()
+
+
+def parse_datetime(value: Any) -> datetime:
+    """Parse a stored ISO timestamp into a datetime without going through pydantic
+
+    Args:
+        value: Datetime object or ISO format string (a trailing "Z" is accepted)
+
+    Returns:
+        datetime object
+    """
+    if isinstance(value, datetime):
+        return value
+    return _parse_iso(value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    # 同一集合内 created_at/updated_at 大量重复，datetime 不可变，可安全共享
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
@@ -1,14 +1,58 @@
+import asyncio
+import hashlib
+import os
+import threading
+import uuid
+from functools import lru_cache
 from pathlib import Path
 import pipmaster as pm
 import traceback
+from typing import TYPE_CHECKING, Optional
 from lightrag.utils import logger
 import aiofiles
 
-from lightrag.lightrag import LightRAG
+if TYPE_CHECKING:
+    from fastapi import UploadFile
+    from lightrag.lightrag import LightRAG
 
 # Temporary file prefix
 temp_prefix = "__tmp__"
 
+# 上传文件写盘时每次读取的块大小：按文件大小取值，介于 1 MiB 与 8 MiB 之间
+UPLOAD_CHUNK_SIZE = 1 << 20
+UPLOAD_MAX_CHUNK_SIZE = 8 << 20
+# 超过该大小的上传写完后落盘并丢弃其页缓存，避免挤出热数据
+UPLOAD_DROP_CACHE_SIZE = 64 << 20
+
+
+def _upload_chunk_size(file: "UploadFile") -> int:
+    size = getattr(file, "size", None)
+    if not size:
+        return UPLOAD_CHUNK_SIZE
+    return min(max(size, UPLOAD_CHUNK_SIZE), UPLOAD_MAX_CHUNK_SIZE)
+
+
+@lru_cache(maxsize=1024)
+def _resolved_dir(path: Path) -> Path:
+    """缓存目录的 resolve() 结果，避免每次上传都对路径各级做 stat"""
+    return path.resolve()
+
+
+def is_safe_collection_id(collection_id: str, base_dir: Path) -> bool:
+    """
+    Check that `collection_id` names a direct child of `base_dir`.
+
+    The base directory is resolved once and cached, so each call costs a single
+    resolve() of the target path.
+    """
+    if not collection_id or collection_id in (".", ".."):
+        return False
+    base = _resolved_dir(base_dir)
+    try:
+        return (base / collection_id).resolve().parent == base
+    except (OSError, ValueError):
+        return False
+
 
 def sanitize_filename(filename: str, input_dir: Path) -> str:
     """
@@ -45,7 +89,7 @@ def sanitize_filename(filename: str, input_dir: Path) -> str:
     # Verify the final path stays within the input directory
     try:
         final_path = (input_dir / clean_name).resolve()
-        if not final_path.is_relative_to(input_dir.resolve()):
+        if not final_path.is_relative_to(_resolved_dir(input_dir)):
             raise ValueError("Unsafe filename detected")
     except (OSError, ValueError):
         raise ValueError("Invalid filename")
@@ -53,8 +97,103 @@ def sanitize_filename(filename: str, input_dir: Path) -> str:
     return clean_name
 
 
+# 每个工作线程复用一块拷贝缓冲区，避免每个块都分配新的 bytes；
+# 默认线程池由整个应用共享，常驻缓冲区最大只到 UPLOAD_CHUNK_SIZE，更大的块按次分配
+_copy_buffers = threading.local()
+
+
+def _get_copy_buffer(size: int) -> memoryview:
+    if size > UPLOAD_CHUNK_SIZE:
+        return memoryview(bytearray(size))
+    buf = getattr(_copy_buffers, "buf", None)
+    if buf is None or len(buf) < size:
+        buf = _copy_buffers.buf = bytearray(UPLOAD_CHUNK_SIZE)
+    return memoryview(buf)[:size]
+
+
+def _copy_upload(src, file_path: Path, chunk_size: int) -> tuple[int, str]:
+    """Copy an upload's file object to `file_path`, hashing it in the same pass."""
+    hasher = hashlib.sha256()
+    size = 0
+    # Python 3.10 的 SpooledTemporaryFile 没有 readinto
+    readinto = getattr(src, "readinto", None)
+    with open(file_path, "wb") as out:
+        if readinto is None:
+            while chunk := src.read(chunk_size):
+                hasher.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        else:
+            mv = _get_copy_buffer(chunk_size)
+            while n := readinto(mv):
+                chunk = mv[:n] if n < chunk_size else mv
+                hasher.update(chunk)
+                out.write(chunk)
+                size += n
+        if size >= UPLOAD_DROP_CACHE_SIZE and hasattr(os, "posix_fadvise"):
+            # DONTNEED 只会丢弃干净页，需先同步写回
+            out.flush()
+            os.fdatasync(out.fileno())
+            os.posix_fadvise(out.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return size, hasher.hexdigest()
+
+
+async def save_upload_file(
+    file: "UploadFile", file_path: Path, chunk_size: Optional[int] = None
+) -> tuple[int, str]:
+    """
+    Save an uploaded file to disk without blocking the event loop.
+
+    The request body has already been spooled by Starlette, so the whole copy
+    runs in one worker thread instead of bouncing to a thread for every chunk.
+    The SHA-256 of the content is computed in the same pass, so no second read
+    is needed to obtain the deduplication key.
+
+    Args:
+        file: The uploaded file
+        file_path: Destination path
+        chunk_size: Number of bytes read per chunk; sized from the upload if None
+
+    Returns:
+        tuple: (bytes written: int, sha256 hex digest: str)
+    """
+    if chunk_size is None:
+        chunk_size = _upload_chunk_size(file)
+    await file.seek(0)
+    return await asyncio.to_thread(_copy_upload, file.file, file_path, chunk_size)
+
+
+def temp_upload_path(file_path: Path) -> Path:
+    """Unique temporary path next to `file_path` for an in-progress upload."""
+    return file_path.with_name(f"{temp_prefix}{uuid.uuid4().hex}.part")
+
+
+def commit_upload(tmp_path: Path, file_path: Path) -> bool:
+    """
+    Atomically publish a fully written upload under its final name.
+
+    Uses a hard link so an existing file is never overwritten and readers never
+    see a partially written file. The caller removes `tmp_path` afterwards.
+
+    Returns:
+        bool: False if `file_path` already exists
+    """
+    try:
+        os.link(tmp_path, file_path)
+    except FileExistsError:
+        return False
+    except OSError:
+        # Filesystem without hard links: fall back to an exclusive create + replace
+        try:
+            os.close(os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        os.replace(tmp_path, file_path)
+    return True
+
+
 async def pipeline_enqueue_file(
-    rag: LightRAG, file_path: Path, track_id: str = None
+    rag: "LightRAG", file_path: Path, track_id: str = None
 ) -> tuple[bool, str]:
     """Add a file to the queue for processing
 
@@ -402,7 +541,7 @@ async def pipeline_enqueue_file(
                 )
 
                 logger.info(
-                    f"Successfully extracted and enqueued file: {file_path.name}"
+                    "Successfully extracted and enqueued file: %s", file_path.name
                 )
 
                 # Move file to __enqueued__ directory after enqueuing
@@ -419,7 +558,9 @@ async def pipeline_enqueue_file(
                     # Move the file
                     file_path.rename(target_path)
                     logger.debug(
-                        f"Moved file to enqueued directory: {file_path.name} -> {unique_filename}"
+                        "Moved file to enqueued directory: %s -> %s",
+                        file_path.name,
+                        unique_filename,
                     )
 
                 except Exception as move_error:
@@ -0,0 +1,42 @@
+from typing import Any, Optional, TypeVar
+
+import orjson
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from lightrag.api.schemas.common import GenericResponse, ORJSON_OPTIONS, orjson_default
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def json_response(
+    data: T, message: Optional[str] = None, status: str = "success"
+) -> Response:
+    """Wrap `data` in a GenericResponse and serialize it with pydantic-core.
+
+    `model_dump_json` emits the bytes in one Rust pass, skipping FastAPI's
+    `jsonable_encoder` + `json.dumps` round-trip and the re-validation against
+    `response_model`. The route's `response_model` is still used for OpenAPI docs.
+    """
+    envelope = GenericResponse[type(data)].model_construct(
+        status=status, message=message, data=data
+    )
+    return Response(
+        content=envelope.model_dump_json(), media_type="application/json"
+    )
+
+
+class ModelORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also encodes (constructed) pydantic models via their
+    field dicts, so large lists are serialized by orjson in one C pass."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+def orjson_response(
+    data: Any, message: Optional[str] = None, status: str = "success"
+) -> ModelORJSONResponse:
+    """Wrap `data` in the GenericResponse envelope and encode it with orjson."""
+    return ModelORJSONResponse({"status": status, "message": message, "data": data})
@@ -3,7 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from enum import Enum
 from .config_manager import get_app_config
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import (
     Any,
     Literal,
@@ -715,12 +715,41 @@ class DocStatusStorage(BaseKVStorage, ABC):
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
 
+    async def get_docs_by_statuses(
+        self, statuses: tuple[DocStatus, ...]
+    ) -> dict[DocStatus, dict[str, DocProcessingStatus]]:
+        """Get all documents for several statuses at once, grouped by status
+
+        The default implementation queries each status separately; backends
+        should override it with a single scan/query when they can.
+        """
+        return {status: await self.get_docs_by_status(status) for status in statuses}
+
     @abstractmethod
     async def get_docs_by_track_id(
         self, track_id: str
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific track_id"""
 
+    async def get_doc_by_file_path(self, file_path: str) -> dict[str, Any] | None:
+        """Get the status record of the document enqueued from `file_path`
+
+        Records that did not fail take precedence over failed ones. The default
+        implementation scans all statuses; backends should override it with an
+        indexed lookup when they can.
+        """
+        failed = None
+        docs_by_status = await self.get_docs_by_statuses(tuple(DocStatus))
+        for status, docs in docs_by_status.items():
+            for doc_id, doc in docs.items():
+                if doc.file_path != file_path:
+                    continue
+                record = {"_id": doc_id, **asdict(doc)}
+                if status != DocStatus.FAILED:
+                    return record
+                failed = record
+        return failed
+
     @abstractmethod
     async def get_docs_paginated(
         self,
@@ -133,7 +133,7 @@ class ConfigStorage:
                 config_data = json.load(f)
 
             # 解析配置
-            config = LightRAGConfig.parse_obj(config_data)
+            config = LightRAGConfig.model_validate(config_data)
             logger.info(f"配置已加载: {self.config_file}")
 
             return config
@@ -160,19 +160,13 @@ class ConfigStorage:
             # 更新元数据
             config.update_metadata()
 
-            # 序列化配置
-            config_data = config.dict()
-
-            # 自定义JSON序列化器处理datetime对象
-            def json_serializer(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+            # 序列化配置（mode="json" 由 pydantic-core 直接输出 ISO 时间字符串）
+            config_data = config.model_dump(mode="json")
 
             # 写入临时文件
             temp_file = self.config_file.with_suffix('.tmp')
             with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False, default=json_serializer)
+                json.dump(config_data, f, indent=2, ensure_ascii=False)
 
             # 设置临时文件权限
             temp_file.chmod(0o600)
@@ -307,7 +301,7 @@ class ConfigStorage:
             with open(backup_path, 'r', encoding='utf-8') as f:
                 config_data = json.load(f)
 
-            config = LightRAGConfig.parse_obj(config_data)
+            config = LightRAGConfig.model_validate(config_data)
 
             # 保存恢复的配置
             self.save_config(config)
@@ -32,6 +32,11 @@ class LightRAGConfig(BaseModel):
     ENABLE_LLM_CACHE_FOR_ENTITY_EXTRACT: bool = True
     ENABLE_LLM_CACHE: bool = True
     MAX_PARALLEL_INSERT: int = 2
+    # 上传后索引的防抖窗口（秒）与单批最大文件数
+    INDEX_DEBOUNCE_SECONDS: float = 0.5
+    INDEX_MAX_BATCH_SIZE: int = 100
+    # 删除请求的合并窗口（秒），0 表示不等待立即执行
+    DELETE_DEBOUNCE_SECONDS: float = 0.5
     MAX_GRAPH_NODES: int = 1000
     CHUNK_OVERLAP_SIZE: int = 100
     SUMMARY_CONTEXT_SIZE: int = 12000
@@ -39,7 +44,7 @@ class LightRAGConfig(BaseModel):
     MAX_ASYNC: int = 4
     SUMMARY_LANGUAGE: str = "Simplified Chinese"
     # store as list for easier programmatic use; if you want to keep the JSON string,
-    # use .json() / .model_dump_json()
+    # use .model_dump_json()
     ENTITY_TYPES: List[str] = Field(
         default_factory=lambda: [
             "Organization",
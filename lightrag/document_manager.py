@@ -1,5 +1,18 @@
+import asyncio
+import json
+import os
+import threading
 from pathlib import Path
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from lightrag.base import DocStatus
+from lightrag.path_manager import get_default_storage_dir
+
+if TYPE_CHECKING:
+    from lightrag.base import DocStatusStorage
+
+# 摘要日志中过期记录超过该数量（且多于有效记录）时整体重写一次
+CONTENT_HASH_COMPACT_SLACK = 1024
 
 
 class DocumentManager:
@@ -52,6 +65,11 @@ class DocumentManager:
         self.workspace = workspace
         self.supported_extensions = supported_extensions
         self.indexed_files = set()
+        self._content_hashes: Optional[Dict[str, str]] = None
+        self._content_log_lines = 0
+        # 串行化同一集合的“查重 -> 发布 -> 记录”过程
+        self.content_lock = asyncio.Lock()
+        self._known_files: Optional[Set[str]] = None
 
         # Create workspace-specific input directory
         # If workspace is provided, create a subdirectory for data isolation
@@ -63,6 +81,13 @@ class DocumentManager:
         # Create input directory if it doesn't exist
         self.input_dir.mkdir(parents=True, exist_ok=True)
 
+        # 上传内容摘要日志，每行一条 {"digest": ..., "filename": ...}，放在输入目录之外
+        self.content_hash_path = (
+            self.base_input_dir.parent
+            / "content_hashes"
+            / f"{workspace or '_default'}.jsonl"
+        )
+
     def scan_directory_for_new_files(self) -> List[Path]:
         """Scan input directory for new files"""
         new_files = []
@@ -77,3 +102,140 @@ class DocumentManager:
 
     def is_supported_file(self, filename: str) -> bool:
         return any(filename.lower().endswith(ext) for ext in self.supported_extensions)
+
+    def _load_known_files(self) -> Set[str]:
+        if self._known_files is None:
+            with os.scandir(self.input_dir) as it:
+                self._known_files = {entry.name for entry in it if entry.is_file()}
+        return self._known_files
+
+    def has_input_file(self, filename: str) -> bool:
+        """Check whether `filename` is in the input directory
+
+        Names are tracked in memory (one scandir on first use), so a miss costs
+        no syscall; a hit is confirmed on disk because indexed files get moved
+        to __enqueued__ or deleted afterwards.
+        """
+        known_files = self._load_known_files()
+        if filename not in known_files:
+            return False
+        if (self.input_dir / filename).exists():
+            return True
+        known_files.discard(filename)
+        return False
+
+    def add_input_file(self, filename: str):
+        self._load_known_files().add(filename)
+
+    def _read_content_hashes(self) -> Dict[str, str]:
+        """Replay the append-only digest log; filename None removes an entry"""
+        hashes: Dict[str, str] = {}
+        lines = 0
+        try:
+            with open(self.content_hash_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 进程中断可能留下半行，跳过
+                        continue
+                    lines += 1
+                    if record.get("filename") is None:
+                        hashes.pop(record.get("digest"), None)
+                    else:
+                        hashes[record["digest"]] = record["filename"]
+        except OSError:
+            pass
+        self._content_log_lines = lines
+        return hashes
+
+    def _append_content_hash(self, digest: str, filename: Optional[str]):
+        self.content_hash_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.content_hash_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"digest": digest, "filename": filename}) + "\n")
+
+    def _compact_content_hashes(self, hashes: Dict[str, str]):
+        tmp_path = self.content_hash_path.with_name(
+            self.content_hash_path.name + ".tmp"
+        )
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for digest, filename in hashes.items():
+                f.write(json.dumps({"digest": digest, "filename": filename}) + "\n")
+        os.replace(tmp_path, self.content_hash_path)
+
+    async def _load_content_hashes(self) -> Dict[str, str]:
+        if self._content_hashes is None:
+            self._content_hashes = await asyncio.to_thread(self._read_content_hashes)
+        return self._content_hashes
+
+    async def _save_content_hash(self, digest: str, filename: Optional[str]):
+        """Append one change to the log instead of rewriting the whole index
+
+        Each upload costs one appended line; the log is rewritten only once the
+        superseded lines outnumber the live entries by CONTENT_HASH_COMPACT_SLACK.
+        """
+        hashes = await self._load_content_hashes()
+        self._content_log_lines += 1
+        stale = self._content_log_lines - len(hashes)
+        if stale > max(len(hashes), CONTENT_HASH_COMPACT_SLACK):
+            await asyncio.to_thread(self._compact_content_hashes, dict(hashes))
+            self._content_log_lines = len(hashes)
+        else:
+            await asyncio.to_thread(self._append_content_hash, digest, filename)
+
+    async def find_duplicate_content(
+        self, digest: str, doc_status: "DocStatusStorage"
+    ) -> Optional[str]:
+        """Return the filename previously uploaded with the same content, if it still counts
+
+        The caller must hold `content_lock` until the upload is published and
+        recorded. An upload counts as a duplicate while it is waiting in the
+        input directory to be enqueued, or once it has a doc status that is not
+        failed. Entries whose document was deleted or failed are pruned so the
+        content can be uploaded again.
+        """
+        hashes = await self._load_content_hashes()
+        filename = hashes.get(digest)
+        if filename is None:
+            return None
+        doc = await doc_status.get_doc_by_file_path(filename)
+        if doc is not None:
+            if doc.get("status") != DocStatus.FAILED:
+                return filename
+        elif self.has_input_file(filename):
+            return filename
+        # 原文档已删除或处理失败，清理过期记录
+        del hashes[digest]
+        await self._save_content_hash(digest, None)
+        return None
+
+    async def record_content_hash(self, digest: str, filename: str):
+        """Record the final published filename for `digest`; caller holds `content_lock`"""
+        (await self._load_content_hashes())[digest] = filename
+        await self._save_content_hash(digest, filename)
+
+
+_managers_lock = threading.Lock()
+_managers: Dict[str, DocumentManager] = {}
+
+
+def get_document_manager(collection_id: str) -> DocumentManager:
+    """Return the cached DocumentManager for a collection's input directory."""
+    manager = _managers.get(collection_id)
+    if manager is not None:
+        return manager
+    with _managers_lock:
+        manager = _managers.get(collection_id)
+        if manager is None:
+            manager = DocumentManager(
+                input_dir=str(get_default_storage_dir() / "inputs"),
+                workspace=collection_id,
+            )
+            _managers[collection_id] = manager
+        return manager
+
+
+def invalidate_document_manager(collection_id: str):
+    """Drop the cached DocumentManager, e.g. after its input directory was replaced."""
+    with _managers_lock:
+        _managers.pop(collection_id, None)
@@ -25,6 +25,17 @@ from .shared_storage import (
 )
 
 
+def _to_doc_status(doc_data: dict[str, Any]) -> DocProcessingStatus:
+    """Build a DocProcessingStatus from a stored record in a single dict build.
+
+    Fields added in newer versions get their defaults, and the deprecated
+    content field is dropped. The stored record itself is not modified.
+    """
+    data = {"file_path": "no-file-path", "metadata": {}, "error_msg": None, **doc_data}
+    data.pop("content", None)
+    return DocProcessingStatus(**data)
+
+
 @final
 @dataclass
 class JsonDocStatusStorage(DocStatusStorage):
@@ -101,19 +112,7 @@ class JsonDocStatusStorage(DocStatusStorage):
             for k, v in self._data.items():
                 if v["status"] == status.value:
                     try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
+                        result[k] = _to_doc_status(v)
                     except KeyError as e:
                         logger.error(
                             f"[{self.workspace}] Missing required field for document {k}: {e}"
@@ -121,6 +120,26 @@ class JsonDocStatusStorage(DocStatusStorage):
                         continue
         return result
 
+    async def get_docs_by_statuses(
+        self, statuses: tuple[DocStatus, ...]
+    ) -> dict[DocStatus, dict[str, DocProcessingStatus]]:
+        """Get all documents for several statuses in a single pass, grouped by status"""
+        result = {status: {} for status in statuses}
+        by_value = {status.value: docs for status, docs in result.items()}
+        async with self._storage_lock:
+            for k, v in self._data.items():
+                docs = by_value.get(v["status"])
+                if docs is None:
+                    continue
+                try:
+                    docs[k] = _to_doc_status(v)
+                except KeyError as e:
+                    logger.error(
+                        f"[{self.workspace}] Missing required field for document {k}: {e}"
+                    )
+                    continue
+        return result
+
     async def get_docs_by_track_id(
         self, track_id: str
     ) -> dict[str, DocProcessingStatus]:
@@ -130,19 +149,7 @@ class JsonDocStatusStorage(DocStatusStorage):
             for k, v in self._data.items():
                 if v.get("track_id") == track_id:
                     try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
+                        result[k] = _to_doc_status(v)
                     except KeyError as e:
                         logger.error(
                             f"[{self.workspace}] Missing required field for document {k}: {e}"
@@ -150,6 +157,20 @@ class JsonDocStatusStorage(DocStatusStorage):
                         continue
         return result
 
+    async def get_doc_by_file_path(self, file_path: str) -> dict[str, Any] | None:
+        """Get the status record of the document enqueued from `file_path` in one pass"""
+        if self._storage_lock is None:
+            raise StorageNotInitializedError("JsonDocStatusStorage")
+        failed = None
+        async with self._storage_lock:
+            for k, v in self._data.items():
+                if v.get("file_path") != file_path:
+                    continue
+                if v.get("status") != DocStatus.FAILED.value:
+                    return {"_id": k, **v}
+                failed = {"_id": k, **v}
+        return failed
+
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
             if self.storage_updated.value:
@@ -240,17 +261,7 @@ class JsonDocStatusStorage(DocStatusStorage):
                     continue
 
                 try:
-                    # Prepare document data
-                    data = doc_data.copy()
-                    data.pop("content", None)
-                    if "file_path" not in data:
-                        data["file_path"] = "no-file-path"
-                    if "metadata" not in data:
-                        data["metadata"] = {}
-                    if "error_msg" not in data:
-                        data["error_msg"] = None
-
-                    doc_status = DocProcessingStatus(**data)
+                    doc_status = _to_doc_status(doc_data)
 
                     # Add sort key for sorting
                     if sort_field == "id":
@@ -1137,21 +1137,17 @@ async def get_all_update_flags_status() -> Dict[str, list]:
     Get update flags status for all namespaces.
 
     Returns:
-        Dict[str, list]: A dictionary mapping namespace names to lists of update flag statuses
+        Dict[str, list]: A dictionary mapping namespace names to lists of update flag statuses (bool)
     """
     if _update_flags is None:
         return {}
 
-    result = {}
+    # Both manager Values and MutableBoolean expose .value
     async with get_internal_lock():
-        for namespace, flags in _update_flags.items():
-            worker_statuses = []
-            for flag in flags:
-                if _is_multiprocess:
-                    worker_statuses.append(flag.value)
-                else:
-                    worker_statuses.append(flag)
-            result[namespace] = worker_statuses
+        result = {
+            namespace: [bool(flag.value) for flag in flags]
+            for namespace, flags in _update_flags.items()
+        }
 
     return result
 
@@ -86,6 +86,9 @@ from .config_manager import get_app_config
 config = configparser.ConfigParser()
 config.read("config.ini", "utf-8")
 
+# Statuses picked up by the enqueue pipeline, in the order they are merged
+_TO_PROCESS_STATUSES = (DocStatus.PROCESSING, DocStatus.FAILED, DocStatus.PENDING)
+
 
 @final
 @dataclass
@@ -1255,16 +1258,13 @@ class LightRAG:
         async with pipeline_status_lock:
             # Ensure only one worker is processing documents
             if not pipeline_status.get("busy", False):
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
+                docs_by_status = await self.doc_status.get_docs_by_statuses(
+                    _TO_PROCESS_STATUSES
                 )
 
                 to_process_docs: dict[str, DocProcessingStatus] = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
+                for status in _TO_PROCESS_STATUSES:
+                    to_process_docs.update(docs_by_status[status])
 
                 if not to_process_docs:
                     logger.info("No documents to process")
@@ -1663,16 +1663,13 @@ class LightRAG:
                 pipeline_status["history_messages"].append(log_message)
 
                 # Check for pending documents again
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
+                docs_by_status = await self.doc_status.get_docs_by_statuses(
+                    _TO_PROCESS_STATUSES
                 )
 
                 to_process_docs = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
+                for status in _TO_PROCESS_STATUSES:
+                    to_process_docs.update(docs_by_status[status])
 
         finally:
             log_message = "Enqueued document processing pipeline stoped"
@@ -1,12 +1,12 @@
+import asyncio
 import inspect
 import logging
 import os
 import json
+import threading
 from lightrag.config_manager import get_app_config
-from lightrag.kg.shared_storage import (
-    finalize_share_data,
-    initialize_pipeline_status,
-)
+from lightrag.kg.shared_storage import initialize_pipeline_status
+from lightrag.base import DocStatus
 from lightrag.lightrag import LightRAG
 from lightrag.rerank import get_rerank_func
 from lightrag.types import GPTKeywordExtractionFormat
@@ -23,21 +23,56 @@ class LightRagManager:
     """LightRAG Manager to handle LightRAG instances per collection"""
 
     def __init__(self):
-        app_config = get_app_config()
-
         self.logger = logging.getLogger("lightrag")
         self.rag_instances = {}
+        # 每个集合一把锁，保证并发的首次请求只创建一个实例
+        self._instance_locks = {}
         self.config_manager = None
-        self.lightrag_config = app_config.lightrag_config
-        self.llm_config = app_config.llm_config
-        self.embedding_config = app_config.embedding_config
-        self.rerank_config = app_config.rerank_config
+        # 恢复被中断文档的后台任务，保留引用以免被回收
+        self._resume_tasks = set()
+
+    # 配置每次从 get_app_config() 读取，进程级单例也能看到 reload_app_config 后的新配置
+    @property
+    def lightrag_config(self):
+        return get_app_config().lightrag_config
+
+    @property
+    def llm_config(self):
+        return get_app_config().llm_config
+
+    @property
+    def embedding_config(self):
+        return get_app_config().embedding_config
+
+    @property
+    def rerank_config(self):
+        return get_app_config().rerank_config
 
     def set_config_manager(self, config_manager):
         """设置配置管理器实例"""
         self.config_manager = config_manager
         self.logger.info("配置管理器已设置")
 
+    def collections_version(self) -> tuple:
+        """返回所有集合文档状态文件的版本戳 (集合名, mtime_ns, size)，用于缓存失效判断"""
+        working_dir = str(self.lightrag_config.WORKING_DIR)
+        if not os.path.isdir(working_dir):
+            return ()
+
+        stamps = []
+        with os.scandir(working_dir) as it:
+            for entry in it:
+                # 跳过 .trash-* 等隐藏目录（清空集合时待后台删除的目录）
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                try:
+                    st = os.stat(os.path.join(entry.path, "kv_store_doc_status.json"))
+                    stamps.append((entry.name, st.st_mtime_ns, st.st_size))
+                except OSError:
+                    stamps.append((entry.name, 0, 0))
+        stamps.sort()
+        return tuple(stamps)
+
     async def list_collections(self):
         working_dir = str(self.lightrag_config.WORKING_DIR)
         if not os.path.exists(working_dir):
@@ -50,7 +85,8 @@ class LightRagManager:
         collections = [
             name
             for name in os.listdir(working_dir)
-            if os.path.isdir(os.path.join(working_dir, name))
+            if not name.startswith(".")
+            and os.path.isdir(os.path.join(working_dir, name))
         ]
 
         result = {}
@@ -72,16 +108,71 @@ class LightRagManager:
 
         return result
 
-    async def get_rag_instance(self, collection_id) -> LightRAG | None:
-        """Get or create a LightRAG instance for the given collection"""
-        working_dir = str(self.lightrag_config.WORKING_DIR)
-        if not os.path.exists(os.path.join(working_dir, collection_id)):
-            return None
-        if collection_id not in self.rag_instances:
-            self.rag_instances[collection_id] = await self.create_lightrag_instance(
-                collection_id
+    def _instance_lock(self, collection_id: str) -> asyncio.Lock:
+        return self._instance_locks.setdefault(collection_id, asyncio.Lock())
+
+    async def get_rag_instance(
+        self, collection_id, create: bool = False
+    ) -> LightRAG | None:
+        """Get or create a LightRAG instance for the given collection
+
+        Returns None for a collection that does not exist yet unless `create`
+        is set, in which case its workspace is initialized.
+        """
+        if not create:
+            working_dir = str(self.lightrag_config.WORKING_DIR)
+            if not os.path.exists(os.path.join(working_dir, collection_id)):
+                return None
+        rag = self.rag_instances.get(collection_id)
+        if rag is not None:
+            return rag
+        async with self._instance_lock(collection_id):
+            rag = self.rag_instances.get(collection_id)
+            if rag is None:
+                rag = await self.create_lightrag_instance(collection_id)
+                self.rag_instances[collection_id] = rag
+        return rag
+
+    async def resume_interrupted(self):
+        """服务启动时恢复因崩溃或重启而中断（pending/processing）的文档处理
+
+        由 lifespan 作为后台任务调度，不阻塞启动；只为存在中断文档的集合创建实例，
+        每个集合的 pipeline 各自在后台运行。
+        """
+        interrupted_statuses = (DocStatus.PENDING.value, DocStatus.PROCESSING.value)
+        collections = await self.list_collections()
+        for collection_id, docs in collections.items():
+            interrupted = sum(
+                1
+                for doc in docs.values()
+                if isinstance(doc, dict) and doc.get("status") in interrupted_statuses
+            )
+            if not interrupted:
+                continue
+            try:
+                rag = await self.get_rag_instance(collection_id)
+            except Exception as e:
+                # 单个集合初始化失败不应影响服务启动
+                self.logger.error(
+                    f"Failed to initialize collection '{collection_id}' for resume: {e}"
+                )
+                continue
+            if rag is None:
+                continue
+            self.logger.info(
+                f"Resuming {interrupted} interrupted document(s) for collection '{collection_id}'"
+            )
+            task = asyncio.create_task(self._process_interrupted(collection_id, rag))
+            self._resume_tasks.add(task)
+            task.add_done_callback(self._resume_tasks.discard)
+
+    async def _process_interrupted(self, collection_id: str, rag: LightRAG):
+        try:
+            await rag.apipeline_process_enqueue_documents()
+        except Exception as e:
+            self.logger.error(
+                f"Failed to resume interrupted documents for collection '{collection_id}': {e}"
             )
-        return self.rag_instances[collection_id]
 
     def _create_optimized_openai_llm_func(self):
         """Create optimized OpenAI LLM function with pre-processed configuration"""
@@ -145,7 +236,7 @@ class LightRagManager:
         async def optimized_embedding_function(texts):
             try:
                 # 获取动态配置
-                embedding_config = self.embedding_config.model_dump()
+                embedding_config = self.embedding_config.__dict__
                 binding = embedding_config["EMBEDDING_BINDING"]
 
                 if binding == "ollama":
@@ -188,11 +279,11 @@ class LightRagManager:
     async def create_lightrag_instance(self, collection_id: str) -> LightRAG:
         """
         Create a new LightRAG instance for the given collection.
-        Since LightRAG is now stateless, we create a fresh instance each time.
+        Routes should go through get_rag_instance, which caches the instance.
         """
         try:
             # 获取动态配置
-            embedding_config = self.embedding_config.model_dump()
+            embedding_config = self.embedding_config.__dict__
             embedding_func = EmbeddingFunc(
                 embedding_dim=embedding_config["EMBEDDING_DIM"],
                 func=self.create_optimized_embedding_function(),
@@ -248,9 +339,42 @@ class LightRagManager:
 
     async def clear_rag_instance(self, collection_id: str):
         """Clear the LightRAG instance for the given collection"""
-        self.rag_instances.pop(collection_id, None)
-        if collection_id in self.rag_instances:
-            rag = self.rag_instances[collection_id]
-            # Clean up database connections
+        async with self._instance_lock(collection_id):
+            rag = self.rag_instances.pop(collection_id, None)
+            if rag is not None:
+                await self._finalize_instance(collection_id, rag)
+
+    async def clear_all_rag_instances(self) -> int:
+        """Finalize and drop every cached instance, e.g. after a config change
+
+        Returns:
+            int: number of instances cleared
+        """
+        collection_ids = list(self.rag_instances)
+        for collection_id in collection_ids:
+            await self.clear_rag_instance(collection_id)
+        return len(collection_ids)
+
+    async def _finalize_instance(self, collection_id: str, rag: LightRAG):
+        # Clean up database connections; shared data (pipeline status) is
+        # process-wide and stays in place for the other collections
+        try:
             await rag.finalize_storages()
-            finalize_share_data()
+        except Exception as e:
+            self.logger.error(
+                f"Failed to finalize storages for collection '{collection_id}': {e}"
+            )
+
+
+_manager_lock = threading.Lock()
+_manager_instance: LightRagManager | None = None
+
+
+def get_lightrag_manager() -> LightRagManager:
+    """Return the process-wide LightRagManager so its rag_instances cache is
+    shared by every route instead of being rebuilt on each request."""
+    global _manager_instance
+    with _manager_lock:
+        if _manager_instance is None:
+            _manager_instance = LightRagManager()
+        return _manager_instance
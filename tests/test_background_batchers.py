@@ -0,0 +1,131 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from lightrag.api.utils import background
+from lightrag.api.utils.background import DeleteBatcher, IndexBatcher
+
+
+async def _drain(batcher):
+    while batcher._workers:
+        await asyncio.gather(*list(batcher._workers.values()))
+
+
+@pytest.fixture
+def indexed(monkeypatch):
+    calls = []
+
+    async def fake_index_items(rag, items):
+        calls.append(list(items))
+
+    monkeypatch.setattr(background, "_index_items", fake_index_items)
+    return calls
+
+
+@pytest.fixture
+def deleted(monkeypatch):
+    calls = []
+    outcome = {}
+
+    async def fake_delete(rag, doc_manager, doc_ids, delete_file):
+        calls.append((list(doc_ids), delete_file))
+        if outcome.get("busy"):
+            return None
+        failed = [doc_id for doc_id in doc_ids if doc_id in outcome.get("failed", ())]
+        return [doc_id for doc_id in doc_ids if doc_id not in failed], failed
+
+    monkeypatch.setattr(background, "background_delete_documents", fake_delete)
+    return calls, outcome
+
+
+@pytest.mark.asyncio
+async def test_index_batcher_merges_uploads_within_debounce_window(indexed):
+    batcher = IndexBatcher(debounce_seconds=0.05, max_batch_size=10)
+    for i in range(3):
+        batcher.submit("c1", object(), Path(f"{i}.txt"), f"track-{i}")
+
+    await _drain(batcher)
+
+    assert indexed == [[(Path(f"{i}.txt"), f"track-{i}") for i in range(3)]]
+
+
+@pytest.mark.asyncio
+async def test_index_batcher_splits_at_max_batch_size(indexed):
+    batcher = IndexBatcher(debounce_seconds=10, max_batch_size=2)
+    batcher.submit_many(
+        "c1", object(), [(Path(f"{i}.txt"), "track") for i in range(5)]
+    )
+
+    # 攒满一批即执行，不等待防抖窗口；剩余的 1 个文件等待下一个窗口
+    await asyncio.sleep(0.05)
+    assert [len(items) for items in indexed] == [2, 2]
+    batcher._full["c1"].set()
+    await _drain(batcher)
+    assert [len(items) for items in indexed] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_index_batcher_keeps_collections_apart(indexed):
+    batcher = IndexBatcher(debounce_seconds=0.01, max_batch_size=10)
+    batcher.submit("c1", object(), Path("a.txt"), "t1")
+    batcher.submit("c2", object(), Path("b.txt"), "t2")
+
+    await _drain(batcher)
+
+    assert sorted(indexed) == [[(Path("a.txt"), "t1")], [(Path("b.txt"), "t2")]]
+
+
+@pytest.mark.asyncio
+async def test_delete_batcher_merges_requests_and_records_results(deleted):
+    calls, outcome = deleted
+    outcome["failed"] = {"doc-3"}
+    batcher = DeleteBatcher(debounce_seconds=0.05)
+    batcher.submit("c1", object(), object(), ["doc-1", "doc-2"], False, "t1")
+    batcher.submit("c1", object(), object(), ["doc-2", "doc-3"], False, "t2")
+
+    assert batcher.get_result("t1") == {"doc-1": "pending", "doc-2": "pending"}
+    await _drain(batcher)
+
+    assert calls == [(["doc-1", "doc-2", "doc-3"], False)]
+    assert batcher.get_result("t1") == {"doc-1": "deleted", "doc-2": "deleted"}
+    assert batcher.get_result("t2") == {"doc-2": "deleted", "doc-3": "failed"}
+
+
+@pytest.mark.asyncio
+async def test_delete_batcher_runs_delete_file_groups_separately(deleted):
+    calls, _ = deleted
+    batcher = DeleteBatcher(debounce_seconds=0.01)
+    batcher.submit("c1", object(), object(), ["doc-1"], False, "t1")
+    batcher.submit("c1", object(), object(), ["doc-2"], True, "t2")
+
+    await _drain(batcher)
+
+    assert calls == [(["doc-1"], False), (["doc-2"], True)]
+
+
+@pytest.mark.asyncio
+async def test_delete_batcher_reports_busy_pipeline(deleted):
+    _, outcome = deleted
+    outcome["busy"] = True
+    batcher = DeleteBatcher(debounce_seconds=0)
+    batcher.submit("c1", object(), object(), ["doc-1"], False, "t1")
+
+    await _drain(batcher)
+
+    assert batcher.get_result("t1") == {"doc-1": "busy"}
+
+
+@pytest.mark.asyncio
+async def test_delete_batcher_evicts_oldest_results(deleted, monkeypatch):
+    monkeypatch.setattr(background, "DELETE_RESULTS_LIMIT", 2)
+    batcher = DeleteBatcher(debounce_seconds=0)
+    for i in range(3):
+        batcher.submit("c1", object(), object(), [f"doc-{i}"], False, f"t{i}")
+
+    await _drain(batcher)
+
+    assert batcher.get_result("t0") is None
+    assert batcher.get_result("t1") == {"doc-1": "deleted"}
+    assert batcher.get_result("t2") == {"doc-2": "deleted"}
+    assert batcher.get_result("unknown") is None
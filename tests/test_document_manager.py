@@ -0,0 +1,90 @@
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.document_manager import DocumentManager
+
+
+class FakeDocStatus:
+    """Minimal doc status storage keyed by the uploaded file name"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def get_doc_by_file_path(self, file_path):
+        return self.docs.get(file_path)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return DocumentManager(str(tmp_path / "inputs"), workspace="c1")
+
+
+async def _upload(manager, doc_status, digest, filename):
+    """Mirror the upload route: reject duplicates, otherwise publish and record"""
+    async with manager.content_lock:
+        duplicate = await manager.find_duplicate_content(digest, doc_status)
+        if duplicate is not None:
+            return duplicate
+        (manager.input_dir / filename).write_text("content")
+        manager.add_input_file(filename)
+        await manager.record_content_hash(digest, filename)
+        return None
+
+
+@pytest.mark.asyncio
+async def test_rejects_duplicate_waiting_in_input_dir(manager):
+    doc_status = FakeDocStatus()
+
+    assert await _upload(manager, doc_status, "h1", "a.txt") is None
+    assert await _upload(manager, doc_status, "h1", "b.txt") == "a.txt"
+    assert not (manager.input_dir / "b.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_rejects_duplicate_of_processed_document(manager):
+    doc_status = FakeDocStatus()
+    await _upload(manager, doc_status, "h1", "a.txt")
+    # 文件已被 pipeline 移出输入目录，以文档状态为准
+    (manager.input_dir / "a.txt").unlink()
+    doc_status.docs["a.txt"] = {"status": DocStatus.PROCESSED}
+
+    assert await _upload(manager, doc_status, "h1", "b.txt") == "a.txt"
+
+
+@pytest.mark.asyncio
+async def test_accepts_content_again_after_failure_or_deletion(manager):
+    doc_status = FakeDocStatus()
+    await _upload(manager, doc_status, "h1", "a.txt")
+    (manager.input_dir / "a.txt").unlink()
+    doc_status.docs["a.txt"] = {"status": DocStatus.FAILED}
+
+    assert await _upload(manager, doc_status, "h1", "b.txt") is None
+
+    # 原文档已删除：既无文档状态也不在输入目录中
+    (manager.input_dir / "b.txt").unlink()
+    assert await _upload(manager, doc_status, "h1", "c.txt") is None
+
+
+@pytest.mark.asyncio
+async def test_content_hashes_survive_restart(manager, tmp_path):
+    doc_status = FakeDocStatus()
+    await _upload(manager, doc_status, "h1", "a.txt")
+    await _upload(manager, doc_status, "h2", "b.txt")
+    doc_status.docs["a.txt"] = {"status": DocStatus.PROCESSED}
+
+    restarted = DocumentManager(str(tmp_path / "inputs"), workspace="c1")
+
+    assert await _upload(restarted, doc_status, "h1", "x.txt") == "a.txt"
+    assert await _upload(restarted, doc_status, "h2", "y.txt") == "b.txt"
+    assert await _upload(restarted, doc_status, "h3", "z.txt") is None
+
+
+@pytest.mark.asyncio
+async def test_compacts_superseded_log_lines(manager, monkeypatch):
+    monkeypatch.setattr("lightrag.document_manager.CONTENT_HASH_COMPACT_SLACK", 4)
+    for i in range(20):
+        await manager.record_content_hash("h1", f"{i}.txt")
+
+    lines = manager.content_hash_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= 5
+    assert (await manager._load_content_hashes()) == {"h1": "19.txt"}
@@ -0,0 +1,37 @@
+import pytest
+from pydantic import ValidationError
+
+from lightrag.api.schemas.document import DeleteDocRequest
+
+
+def test_delete_request_strips_doc_ids():
+    request = DeleteDocRequest(doc_ids=["  doc-1 ", "doc-2"])
+
+    assert request.doc_ids == ["doc-1", "doc-2"]
+    assert request.delete_file is False
+
+
+@pytest.mark.parametrize(
+    "doc_ids, message",
+    [
+        ([], "Document IDs list cannot be empty"),
+        (["doc-1", "   "], "Document ID cannot be empty"),
+        (["doc-1", ""], "Document ID cannot be empty"),
+        (["doc-1", " doc-1"], "Document IDs must be unique"),
+    ],
+)
+def test_delete_request_rejects_invalid_doc_ids(doc_ids, message):
+    with pytest.raises(ValidationError) as exc_info:
+        DeleteDocRequest(doc_ids=doc_ids)
+
+    errors = exc_info.value.errors()
+    assert len(errors) == 1
+    assert errors[0]["loc"] == ("doc_ids",)
+    assert message in errors[0]["msg"]
+
+
+def test_delete_request_requires_doc_ids():
+    with pytest.raises(ValidationError) as exc_info:
+        DeleteDocRequest.model_validate_json('{"delete_file": true}')
+
+    assert exc_info.value.errors()[0]["type"] == "missing"